@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class CatalogConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'catalog'
+
+    def ready(self):
+        from utils.sqlite import configure_connection
+        from utils.timing import install_execute_wrapper
+
+        connection_created.connect(configure_connection, dispatch_uid='sqlite_profile')
+        connection_created.connect(install_execute_wrapper, dispatch_uid='server_timing')
@@ -0,0 +1,100 @@
+import math
+import random
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Iterator, Optional, Sequence
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from movies.models import Movie
+from planets.models import Planet
+
+
+@contextmanager
+def benchmark_database(verbosity: int = 0, name: Optional[str] = None) -> Iterator[None]:
+    """
+    Run the block against a freshly migrated throwaway database, the same way
+    the test runner does, so benchmarks never touch the real catalog.
+
+    ``name`` overrides the test database name, e.g. to get an SQLite file
+    instead of the in-memory database.
+    """
+    test_settings = connection.settings_dict['TEST']
+    test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+        teardown_test_environment()
+        test_settings['NAME'] = test_name
+
+
+def generate_catalog(movies: int, planets: int, batch_size: int = 5000, seed: int = 0) -> None:
+    """Bulk insert synthetic movies and planets."""
+    rng = random.Random(seed)
+    first_release = date(1977, 5, 25)
+
+    for start in range(0, movies, batch_size):
+        Movie.objects.bulk_create(
+            Movie(
+                name=f"Episode {number} {rng.choice(['Hope', 'Empire', 'Jedi', 'Menace', 'Clones', 'Sith'])}",
+                release_date=first_release + timedelta(days=rng.randrange(50 * 365)),
+                is_favorite=rng.random() < 0.1,
+            )
+            for number in range(start, min(start + batch_size, movies))
+        )
+
+    for start in range(0, planets, batch_size):
+        Planet.objects.bulk_create(
+            Planet(
+                name=f"{rng.choice(['Tatooine', 'Alderaan', 'Hoth', 'Dagobah', 'Endor'])} {number}",
+                is_favorite=rng.random() < 0.1,
+            )
+            for number in range(start, min(start + batch_size, planets))
+        )
+
+
+def measure(func: Callable, repeat: int = 1) -> float:
+    """Best wall-clock time of ``repeat`` runs of ``func``, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank ``q``-th percentile (0-100) of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+
+class QueryCounter:
+    """Thread-safe ``connection.execute_wrapper`` that counts the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
@@ -0,0 +1,186 @@
+from collections import Counter
+from typing import Dict, Optional, Tuple, Type
+
+from django.db import connections, models, router, transaction
+from django.db.migrations.operations.base import Operation
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+
+from catalog.models import CatalogCounter
+from utils.sqlite import write_lock
+
+
+def count_rows(model: Type[models.Model], histogram_field: Optional[str] = None) -> Counter:
+    """Every counter of ``model`` computed from scratch, with one aggregate and one GROUP BY query."""
+    label = model._meta.label_lower
+    aggregate = model.objects.aggregate(total=Count('pk'), favorites=Count('pk', filter=Q(is_favorite=True)))
+    counts = Counter({f"{label}:total": aggregate['total'], f"{label}:favorites": aggregate['favorites']})
+    if histogram_field:
+        years = model.objects.annotate(year=ExtractYear(histogram_field)).values_list('year')
+        for year, count in years.annotate(count=Count('pk')).order_by():
+            if year is not None:
+                counts[f"{label}:{histogram_field}:{year}"] = count
+    return +counts
+
+
+class CreateCounterTriggers(Operation):
+    """
+    Create the SQLite triggers that keep the ``CatalogCounter`` rows of a model
+    (``"app_label.ModelName"``) up to date: its total, its favorites and, with
+    ``histogram_field``, its rows per year of that date field.
+
+    Like ``CreateSearchIndex``, every write path (``save()``, ``bulk_create()``,
+    ``QuerySet.update()``, raw SQL) is counted in the statement that makes it,
+    without any extra round trip. Schema changes that make SQLite rebuild the
+    table drop the triggers, so such migrations need to recreate them
+    afterwards. On other database vendors this is a no-op and the statistics
+    are counted on every read.
+    """
+
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model: str, histogram_field: Optional[str] = None):
+        self.model = model
+        self.histogram_field = histogram_field
+
+    def deconstruct(self):
+        kwargs = {"model": self.model}
+        if self.histogram_field:
+            kwargs["histogram_field"] = self.histogram_field
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+
+        model = to_state.apps.get_model(self.model)
+        table = model._meta.db_table
+        label = model._meta.label_lower
+        counters = to_state.apps.get_model('catalog', 'CatalogCounter')._meta.db_table
+        key_column, value_column = (schema_editor.quote_name(name) for name in ('key', 'value'))
+        favorite = model._meta.get_field('is_favorite').column
+
+        def add(key: str, delta: str, condition: str) -> str:
+            # The WHERE also lets SQLite tell the upsert's ON CONFLICT from a join constraint.
+            return (
+                f"INSERT INTO {counters} ({key_column}, {value_column}) SELECT {key}, {delta} WHERE {condition} "
+                f"ON CONFLICT ({key_column}) DO UPDATE SET {value_column} = {value_column} + excluded.{value_column};"
+            )
+
+        inserted = [add(f"'{label}:total'", "1", "1"), add(f"'{label}:favorites'", "1", f"new.{favorite}")]
+        deleted = [add(f"'{label}:total'", "-1", "1"), add(f"'{label}:favorites'", "-1", f"old.{favorite}")]
+        updated = [
+            add(f"'{label}:favorites'", f"new.{favorite} - old.{favorite}", f"new.{favorite} IS NOT old.{favorite}")
+        ]
+        updated_columns = [favorite]
+        if self.histogram_field:
+            column = model._meta.get_field(self.histogram_field).column
+            # Dates are stored as YYYY-MM-DD; the cast drops the leading zeros that Python's years do not have.
+            new_year, old_year = (f"CAST(substr({row}.{column}, 1, 4) AS INTEGER)" for row in ("new", "old"))
+            new_key, old_key = (f"'{label}:{self.histogram_field}:' || {year}" for year in (new_year, old_year))
+            inserted.append(add(new_key, "1", f"new.{column} IS NOT NULL"))
+            deleted.append(add(old_key, "-1", f"old.{column} IS NOT NULL"))
+            updated += [
+                add(old_key, "-1", f"old.{column} IS NOT NULL AND {old_year} IS NOT {new_year}"),
+                add(new_key, "1", f"new.{column} IS NOT NULL AND {old_year} IS NOT {new_year}"),
+            ]
+            updated_columns.append(column)
+
+        trigger = f"{table}_counters"
+        schema_editor.execute(f"CREATE TRIGGER {trigger}_ai AFTER INSERT ON {table} BEGIN {' '.join(inserted)} END")
+        schema_editor.execute(f"CREATE TRIGGER {trigger}_ad AFTER DELETE ON {table} BEGIN {' '.join(deleted)} END")
+        # Writes that leave the counted columns out of their SET, e.g. of custom names, skip it.
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_au AFTER UPDATE OF {', '.join(updated_columns)} ON {table} "
+            f"BEGIN {' '.join(updated)} END"
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+
+        model = from_state.apps.get_model(self.model)
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {model._meta.db_table}_counters_{suffix}")
+
+    def describe(self):
+        return f"Create counter triggers on {self.model}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model.split('.')[-1].lower()}_counter_triggers"
+
+
+class CatalogCounters:
+    """
+    Catalog statistics kept as running totals in ``CatalogCounter``, so that
+    reading them costs one query on a table of a few dozen rows instead of
+    COUNT/GROUP BY scans of the catalog.
+
+    The totals are maintained by the triggers of ``CreateCounterTriggers``, in
+    the transaction of every write. ``repair`` recomputes everything and
+    reports the drift, e.g. of writes made while the triggers were missing.
+    """
+
+    def __init__(self):
+        # Watched models and the date field of their per-year histogram.
+        self.histogram_fields: Dict[Type[models.Model], Optional[str]] = {}
+
+    def watch(self, model: Type[models.Model], histogram_field: Optional[str] = None) -> None:
+        self.histogram_fields[model] = histogram_field
+
+    def get_values(self) -> Dict[str, int]:
+        if connections[router.db_for_read(CatalogCounter)].vendor != 'sqlite':
+            # No triggers keep the table up to date there.
+            values = Counter()
+            for model, histogram_field in self.histogram_fields.items():
+                values.update(count_rows(model, histogram_field))
+            return dict(values)
+        return dict(CatalogCounter.objects.values_list('key', 'value'))
+
+    def get_stats(self) -> dict:
+        values = self.get_values()
+        stats = {}
+        for model, histogram_field in self.histogram_fields.items():
+            label = model._meta.label_lower
+            model_stats = {
+                "total": values.get(f"{label}:total", 0),
+                "favorites": values.get(f"{label}:favorites", 0),
+            }
+            if histogram_field:
+                prefix = f"{label}:{histogram_field}:"
+                model_stats[f"by_{histogram_field}_year"] = {
+                    key[len(prefix):]: value
+                    for key, value in sorted(values.items()) if key.startswith(prefix) and value
+                }
+            stats[str(model._meta.verbose_name_plural)] = model_stats
+        return stats
+
+    def repair(self, dry_run: bool = False) -> Dict[str, Tuple[int, int]]:
+        """
+        Recompute every counter and overwrite the stored ones (unless
+        ``dry_run``); returns ``{key: (stored, actual)}`` for the ones that drifted.
+        """
+        with write_lock, transaction.atomic():
+            stored = dict(CatalogCounter.objects.select_for_update().values_list('key', 'value'))
+            actual = Counter()
+            for model, histogram_field in self.histogram_fields.items():
+                actual.update(count_rows(model, histogram_field))
+
+            drift = {
+                key: (stored.get(key, 0), actual.get(key, 0))
+                for key in sorted(stored.keys() | actual.keys()) if stored.get(key, 0) != actual.get(key, 0)
+            }
+            if drift and not dry_run:
+                CatalogCounter.objects.all().delete()
+                CatalogCounter.objects.bulk_create(
+                    [CatalogCounter(key=key, value=value) for key, value in actual.items()]
+                )
+        return drift
+
+
+catalog_counters = CatalogCounters()
@@ -0,0 +1,135 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.http.request import HttpRequest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from catalog.models import Tombstone
+from utils.pagination import get_limit_query_param
+from utils.sqlite import write_lock
+
+
+class WatermarkExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The watermark is older than the kept deletions; fetch the full list again."
+    default_code = 'watermark_expired'
+
+
+def encode_watermark(timestamp: datetime, pk: int) -> str:
+    # Microseconds are kept, like in the keyset cursors, or the seek could skip rows.
+    payload = json.dumps([timestamp.isoformat(), pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_watermark(watermark: str) -> Tuple[datetime, int]:
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(watermark.encode()))
+        timestamp = parse_datetime(value)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        timestamp = pk = None
+    if timestamp is None or timezone.is_naive(timestamp) or not isinstance(pk, int):
+        raise ValidationError({'since': ['Invalid watermark.']})
+    return timestamp, pk
+
+
+class ChangePage(NamedTuple):
+    rows: list
+    deleted: List[int]
+    watermark: str
+    has_more: bool
+
+
+def _seek(queryset: QuerySet, timestamp_field: str, id_field: str, position: Tuple[datetime, int]) -> QuerySet:
+    # `>=` plus an exclusion rather than an OR, so SQLite can range-scan the timestamp index.
+    timestamp, pk = position
+    return queryset.filter(**{f'{timestamp_field}__gte': timestamp}).exclude(
+        **{timestamp_field: timestamp, f'{id_field}__lte': pk}
+    )
+
+
+def read_changes(request: HttpRequest, rows: QuerySet, row_position: Callable) -> ChangePage:
+    """
+    One page of the changes to the model of ``rows`` after ``?since=``.
+
+    Changed rows (ordered by ``(updated_at, id)``) and tombstones (ordered by
+    ``(deleted_at, object_id)``) are merged into one sequence and cut after
+    ``?limit=`` entries; the returned watermark is the position of the last
+    one, so it is both the cursor of the next page and, once ``has_more`` is
+    false, what the client sends on its next refresh. Both are read in one
+    transaction so that they come from the same snapshot.
+    """
+    since = request.GET.get('since')
+    position = decode_watermark(since) if since else None
+    limit = get_limit_query_param(request)
+
+    now = timezone.now()
+    if position is not None and position[0] < now - timedelta(days=settings.CHANGE_FEED['RETENTION_DAYS']):
+        raise WatermarkExpired()
+    # Writers take `updated_at` before waiting for the write lock, so recent rows may still be joined by older ones.
+    settled_at = now - timedelta(seconds=settings.CHANGE_FEED['SETTLE_SECONDS'])
+
+    model = rows.model
+    # Strictly before: the watermark of an exhausted page is `(settled_at, 0)`, which the next poll seeks past.
+    rows = rows.filter(updated_at__lt=settled_at)
+    tombstones = Tombstone.objects.using(rows.db).filter(model=model._meta.label_lower, deleted_at__lt=settled_at)
+    if position is not None:
+        rows = _seek(rows, 'updated_at', 'id', position)
+        tombstones = _seek(tombstones, 'deleted_at', 'object_id', position)
+
+    with transaction.atomic(using=rows.db):
+        rows = list(rows.order_by('updated_at', 'id')[:limit + 1])
+        tombstones = list(tombstones.order_by('deleted_at', 'object_id').values_list('deleted_at', 'object_id')[
+            :limit + 1
+        ])
+
+    entries = sorted(
+        [(row_position(row, 'updated_at'), row) for row in rows] + [(tombstone, None) for tombstone in tombstones],
+        key=lambda entry: entry[0],
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    last_position = entries[-1][0] if entries else position
+    if not has_more:
+        # Nothing is left up to `settled_at`, so idle clients' watermarks keep up with the retention window.
+        last_position = max(last_position or (settled_at, 0), (settled_at, 0))
+
+    changed = [row for _, row in entries if row is not None]
+    # A deleted id that was reused since is already replaced by its newer row.
+    changed_ids = {row_id for (_, row_id), row in entries if row is not None}
+    deleted = [row_id for (_, row_id), row in entries if row is None and row_id not in changed_ids]
+    return ChangePage(changed, deleted, encode_watermark(*last_position), has_more)
+
+
+class Tombstones:
+    """Records a ``Tombstone`` in the transaction of every deletion of a watched model."""
+
+    def watch(self, model: Type[models.Model]) -> None:
+        post_delete.connect(self._record, sender=model, weak=False, dispatch_uid='tombstones')
+
+    def _record(self, sender, instance, using, **kwargs):
+        Tombstone.objects.using(using).create(
+            model=sender._meta.label_lower, object_id=instance.pk, deleted_at=timezone.now()
+        )
+
+    @staticmethod
+    def purge(older_than: Optional[datetime] = None) -> int:
+        """Delete the tombstones no watermark may still need; returns how many."""
+        if older_than is None:
+            older_than = timezone.now() - timedelta(days=settings.CHANGE_FEED['RETENTION_DAYS'])
+        with write_lock, transaction.atomic():
+            deleted, _ = Tombstone.objects.filter(deleted_at__lt=older_than).delete()
+        return deleted
+
+
+tombstones = Tombstones()
@@ -0,0 +1,190 @@
+import json
+import re
+from collections import Counter
+from itertools import islice
+from typing import Iterator, List, TextIO
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from utils.signals import bulk_write
+from utils.sqlite import write_lock
+
+# Characters read from the dump at a time, and the largest single record accepted.
+READ_SIZE = 1 << 16
+MAX_RECORD_SIZE = 1 << 20
+
+_NON_WHITESPACE = re.compile(r'\S')
+
+
+def detect_format(file: TextIO) -> str:
+    """``json`` for a top-level array, ``ndjson`` for one object per line; the file is rewound."""
+    match = _NON_WHITESPACE.search(file.read(READ_SIZE))
+    file.seek(0)
+    return 'json' if match and match.group() == '[' else 'ndjson'
+
+
+def iter_ndjson_records(file: TextIO, skip: int = 0) -> Iterator[dict]:
+    """The records of an NDJSON dump, one line at a time; the first ``skip`` ones are not even parsed."""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        if skip:
+            skip -= 1
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            raise ValueError(f"NDJSON parse error on line {line_number} - {exc}")
+
+
+def iter_json_records(file: TextIO, skip: int = 0) -> Iterator[dict]:
+    """
+    The items of a top-level JSON array, decoded one at a time from a buffer
+    of about ``READ_SIZE`` characters, so memory does not grow with the dump.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def read_more() -> None:
+        nonlocal buffer, position, eof
+        if len(buffer) - position > MAX_RECORD_SIZE:
+            raise ValueError(f"JSON parse error - a record is larger than {MAX_RECORD_SIZE} characters")
+        chunk = file.read(READ_SIZE)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+    def next_token() -> str:
+        nonlocal position
+        while True:
+            match = _NON_WHITESPACE.search(buffer, position)
+            if match:
+                position = match.start()
+                return match.group()
+            if eof:
+                return ""
+            position = len(buffer)
+            read_more()
+
+    def decode_value():
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ValueError(f"JSON parse error - {exc}")
+            else:
+                # A value that ends the buffer, such as a number, may continue in the next chunk.
+                if end < len(buffer) or eof:
+                    position = end
+                    return value
+            read_more()
+
+    if next_token() != "[":
+        raise ValueError("JSON parse error - the dump must be an array of records")
+    position += 1
+    if next_token() == "]":
+        return
+
+    while True:
+        next_token()
+        record = decode_value()
+        if skip:
+            skip -= 1
+        else:
+            yield record
+
+        token = next_token()
+        if token == "]":
+            return
+        if token != ",":
+            raise ValueError(f"JSON parse error - expected ',' or ']' but found {token!r}")
+        position += 1
+
+
+def normalize_record(record) -> dict:
+    """
+    Accept SWAPI shapes as well: Django fixtures (``{"model": ..., "fields": {...}}``)
+    and films named by ``title``.
+    """
+    if not isinstance(record, dict):
+        return record
+    record = record.get('fields', record)
+    if 'name' not in record and 'title' in record:
+        record = {**record, 'name': record['title']}
+    return record
+
+
+class CatalogImporter:
+    """
+    Upserts batches of dump records into the model of ``serializer_class``,
+    matching rows by ``name``.
+
+    Records are validated one by one with the model serializer and the invalid
+    ones are skipped. Django 4.0 has no ``bulk_create(update_conflicts=...)``
+    (and ``name`` is not unique), so each batch looks its names up with one
+    ``IN`` query, ``bulk_update``s the rows whose columns changed and
+    ``bulk_create``s the rest, all in one transaction. Favorites are user
+    state and are never imported.
+    """
+
+    def __init__(self, serializer_class, batch_size: int):
+        self.model = serializer_class.Meta.model
+        self.serializer = serializer_class()
+        self.batch_size = batch_size
+        self.fields = [name for name in serializer_class.Meta.fields if name != 'is_favorite']
+        self.stats = Counter()
+        self.errors = []
+
+    def validate(self, records: List, first_index: int) -> dict:
+        """Valid records by name (the last one wins); errors are collected in ``self.errors``."""
+        self.errors = []
+        items = {}
+        for index, record in enumerate(records, start=first_index):
+            try:
+                attrs = self.serializer.run_validation(normalize_record(record))
+            except serializers.ValidationError as exc:
+                self.errors.append({"index": index, **(exc.detail if isinstance(exc.detail, dict) else {})})
+                continue
+            items[attrs['name']] = {name: attrs[name] for name in self.fields}
+        return items
+
+    def import_batch(self, records: List, first_index: int) -> None:
+        items = self.validate(records, first_index)
+        self.stats['invalid'] += len(self.errors)
+
+        with write_lock, transaction.atomic():
+            now = timezone.now()
+            changed, matched = [], set()
+            for pk, *values in self.model.objects.filter(name__in=list(items)).values_list('id', *self.fields):
+                attrs = items[values[0]]
+                matched.add(values[0])
+                if [attrs[name] for name in self.fields] != values:
+                    changed.append(self.model(id=pk, updated_at=now, **attrs))
+                else:
+                    self.stats['unchanged'] += 1
+
+            self.model.objects.bulk_update(changed, [*self.fields, 'updated_at'], batch_size=self.batch_size)
+            created = self.model.objects.bulk_create(
+                [self.model(**attrs) for name, attrs in items.items() if name not in matched],
+                batch_size=self.batch_size,
+            )
+            if changed or created:
+                pks = [instance.pk for instance in (*changed, *created)]
+                bulk_write.send(sender=self.model, pks=None if None in pks else pks)
+
+        self.stats['updated'] += len(changed)
+        self.stats['created'] += len(created)
+
+    def import_records(self, records: Iterator, first_index: int = 0) -> Iterator[int]:
+        """Import ``records`` batch by batch, yielding the index of the next record after each commit."""
+        index = first_index
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return
+            self.import_batch(batch, index)
+            index += len(batch)
+            yield index
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from catalog.benchmark import benchmark_database, generate_catalog, percentile
+
+
+def summarize(latencies: List[float], elapsed: float) -> str:
+    return f"{len(latencies) / elapsed:>8,.0f} requests/s  p99 {percentile(latencies, 99) * 1000:>8.1f} ms"
+
+
+class Command(BaseCommand):
+    help = "Compare requests/second and p99 latency of the WSGI list view and its ASGI counterpart."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Rows per model.")
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per entry point.")
+        parser.add_argument('--concurrency', type=int, default=64, help="Requests in flight at once.")
+        parser.add_argument('--limit', type=int, default=50, help="Page size of each request.")
+
+    def handle(self, *args, **options):
+        total, concurrency = options['requests'], options['concurrency']
+        query = f"?limit={options['limit']}"
+
+        # The benchmark measures the views, not the response cache in front of the sync ones.
+        with benchmark_database(), override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        }):
+            generate_catalog(movies=options['rows'], planets=options['rows'])
+
+            for name, path in [('movies', '/movies/'), ('planets', '/planets/')]:
+                wsgi = self.run_wsgi(f"{path}{query}", total, concurrency)
+                asgi = asyncio.run(self.run_asgi(f"{path}async/{query}", total, concurrency))
+                self.stdout.write(f"{name:<8} WSGI: {wsgi}")
+                self.stdout.write(f"{name:<8} ASGI: {asgi}")
+
+    @staticmethod
+    def run_wsgi(path: str, total: int, concurrency: int) -> str:
+        client = Client()
+
+        def request() -> float:
+            started_at = time.perf_counter()
+            client.get(path)
+            return time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(lambda _: request(), range(total)))
+        return summarize(latencies, time.perf_counter() - started_at)
+
+    @staticmethod
+    async def run_asgi(path: str, total: int, concurrency: int) -> str:
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request() -> float:
+            async with semaphore:
+                started_at = time.perf_counter()
+                await client.get(path)
+                return time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        latencies = await asyncio.gather(*(request() for _ in range(total)))
+        return summarize(latencies, time.perf_counter() - started_at)
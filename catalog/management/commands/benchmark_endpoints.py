@@ -0,0 +1,309 @@
+import json
+import logging
+import platform
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from importlib import import_module
+from typing import Callable, List, NamedTuple, Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog.benchmark import (QueryCounter, benchmark_database,
+                               generate_catalog, peak_rss_mb, percentile)
+from catalog.feed import encode_watermark
+
+BENCHMARKED_URLCONFS = ('movies.urls', 'planets.urls')
+
+
+class Endpoint(NamedTuple):
+    url_name: str
+    label: str
+    method: str
+    # Builds the path and the JSON body (or None) of one request.
+    build: Callable[[random.Random], tuple]
+
+
+def get_endpoints(plural: str, singular: str, search_term: str, make_item: Callable, rows: int) -> List[Endpoint]:
+    def random_id(rng: random.Random) -> int:
+        return rng.randrange(1, rows + 1)
+
+    def list_request(url_name: str, query: str) -> Callable:
+        return lambda rng: (f"{reverse(url_name)}?{query}", None)
+
+    def id_request(url_name: str) -> Callable:
+        return lambda rng: (reverse(url_name, args=(random_id(rng),)), None)
+
+    return [
+        Endpoint(f'{plural}_list', f'{plural}_list?limit=50', 'GET', list_request(f'{plural}_list', 'limit=50')),
+        Endpoint(
+            f'{plural}_list', f'{plural}_list?limit=50&ordering=name', 'GET',
+            list_request(f'{plural}_list', 'limit=50&ordering=name'),
+        ),
+        Endpoint(
+            f'{plural}_list', f'{plural}_list?limit=50&name={search_term}', 'GET',
+            list_request(f'{plural}_list', f'limit=50&name={search_term}'),
+        ),
+        Endpoint(
+            f'{plural}_list', f'{plural}_list?ids=[50]', 'GET',
+            lambda rng: (f"{reverse(f'{plural}_list')}?ids={','.join(str(random_id(rng)) for _ in range(50))}", None),
+        ),
+        Endpoint(
+            f'{plural}_list', f'{plural}_list?is_favorite=true&stream=true', 'GET',
+            list_request(f'{plural}_list', 'is_favorite=true&stream=true'),
+        ),
+        Endpoint(
+            f'{plural}_changes', f'{plural}_changes?limit=50', 'GET', list_request(f'{plural}_changes', 'limit=50')
+        ),
+        Endpoint(
+            f'{plural}_changes', f'{plural}_changes?since=[1 hour ago]', 'GET',
+            lambda rng: (
+                f"{reverse(f'{plural}_changes')}?since={encode_watermark(timezone.now() - timedelta(hours=1), 0)}",
+                None,
+            ),
+        ),
+        Endpoint(
+            f'{plural}_export', f'{plural}_export.ndjson', 'GET',
+            lambda rng: (reverse(f'{plural}_export', args=('ndjson',)), None),
+        ),
+        Endpoint(
+            f'{plural}_export', f'{plural}_export.csv?updated_since', 'GET',
+            lambda rng: (f"{reverse(f'{plural}_export', args=('csv',))}?updated_since=2000-01-01T00:00:00Z", None),
+        ),
+        Endpoint(f'{singular}_detail', f'{singular}_detail', 'GET', id_request(f'{singular}_detail')),
+        Endpoint(f'{singular}_favorite', f'{singular}_favorite', 'POST', id_request(f'{singular}_favorite')),
+        Endpoint(
+            f'{plural}_bulk', f'{plural}_bulk[100]', 'POST',
+            lambda rng: (reverse(f'{plural}_bulk'), [make_item(rng.randrange(10 ** 9)) for _ in range(100)]),
+        ),
+        Endpoint(
+            f'{plural}_bulk_favorite', f'{plural}_bulk_favorite[100]', 'POST',
+            lambda rng: (reverse(f'{plural}_bulk_favorite'), [{"id": random_id(rng)} for _ in range(100)]),
+        ),
+        Endpoint(
+            f'{plural}_list_async', f'{plural}_list_async?limit=50', 'GET',
+            list_request(f'{plural}_list_async', 'limit=50'),
+        ),
+        Endpoint(f'{singular}_detail_async', f'{singular}_detail_async', 'GET', id_request(f'{singular}_detail_async')),
+        Endpoint(
+            f'{singular}_favorite_async', f'{singular}_favorite_async', 'POST', id_request(f'{singular}_favorite_async')
+        ),
+    ]
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every movies/planets endpoint against a synthetic catalog (10k to 10M rows per model): "
+        "throughput, p50/p95/p99 latency, queries per request and peak RSS, optionally compared to a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000, help="Rows per model.")
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Client threads.")
+        parser.add_argument('--endpoints', default='', help="Only run endpoints whose label contains this.")
+        parser.add_argument(
+            '--server', action='store_true',
+            help="Send the requests over HTTP to a threaded WSGI server instead of the test client. "
+                 "Queries run while streaming a response body are not counted in this mode.",
+        )
+        parser.add_argument('--response-cache', action='store_true', help="Keep the response cache enabled.")
+        parser.add_argument('--database-file', default=None, help="SQLite file for the catalog; in memory if omitted.")
+        parser.add_argument('--output', default=None, help="Write the results as JSON to this file.")
+        parser.add_argument('--baseline', default=None, help="JSON results of an earlier run to compare against.")
+        parser.add_argument(
+            '--max-regression', type=float, default=None,
+            help="Fail if any endpoint's p99 or throughput is this many percent worse than the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        # Failed requests are counted, not logged one traceback at a time.
+        logging.getLogger('django.request').disabled = True
+        caches = None if options['response_cache'] else {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        }
+
+        with benchmark_database(name=options['database_file']), \
+                override_settings(ALLOWED_HOSTS=['*'], **({'CACHES': caches} if caches else {})):
+            generate_catalog(movies=options['rows'], planets=options['rows'])
+
+            rows = options['rows']
+            endpoints = [
+                *get_endpoints('movies', 'movie', 'hope', lambda index: {
+                    "name": f"Benchmark {index}", "release_date": "2022-05-01",
+                }, rows),
+                *get_endpoints('planets', 'planet', 'hoth', lambda index: {"name": f"Benchmark {index}"}, rows),
+                Endpoint(
+                    'catalog_search', 'catalog_search?name=hoth&limit=50', 'GET',
+                    lambda rng: (f"{reverse('catalog_search')}?name=hoth&limit=50", None),
+                ),
+                Endpoint(
+                    'catalog_autocomplete', 'catalog_autocomplete?name=[prefix]', 'GET',
+                    lambda rng: (
+                        f"{reverse('catalog_autocomplete')}?name={rng.choice(['h', 'ho', 'hot', 'ep', 'tat', 'end'])}",
+                        None,
+                    ),
+                ),
+            ]
+            self.check_coverage(endpoints)
+            endpoints = [endpoint for endpoint in endpoints if options['endpoints'] in endpoint.label]
+
+            counter = QueryCounter()
+            server = self.start_server(counter) if options['server'] else None
+            send = self.get_http_sender(server) if server else self.get_client_sender(counter)
+            try:
+                results = [self.run_endpoint(endpoint, send, counter, options) for endpoint in endpoints]
+            finally:
+                if server:
+                    server.shutdown()
+                    server.server_close()
+
+        report = {
+            'meta': {
+                'rows': rows,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'transport': 'wsgi-server' if options['server'] else 'test-client',
+                'response_cache': options['response_cache'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'started_at': datetime.now().astimezone().isoformat(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                self.compare(json.load(file)['results'], results, options['max_regression'])
+
+    def check_coverage(self, endpoints: List[Endpoint]) -> None:
+        covered = {endpoint.url_name for endpoint in endpoints}
+        for urlconf in BENCHMARKED_URLCONFS:
+            for pattern in import_module(urlconf).urlpatterns:
+                if pattern.name not in covered:
+                    self.stderr.write(f"No benchmark scenario for the '{pattern.name}' endpoint.")
+
+    @staticmethod
+    def get_client_sender(counter: QueryCounter) -> Callable:
+        local = threading.local()
+
+        def send(method: str, path: str, body: Optional[list]) -> int:
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            with connection.execute_wrapper(counter):
+                if body is None:
+                    response = local.client.generic(method, path)
+                else:
+                    response = local.client.generic(method, path, json.dumps(body), 'application/json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            return response.status_code
+
+        return send
+
+    @staticmethod
+    def start_server(counter: QueryCounter) -> ThreadedWSGIServer:
+        application = get_wsgi_application()
+
+        def counted_application(environ, start_response):
+            with connection.execute_wrapper(counter):
+                return application(environ, start_response)
+
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler)
+        server.set_app(counted_application)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    @staticmethod
+    def get_http_sender(server: ThreadedWSGIServer) -> Callable:
+        host, port = server.server_address[:2]
+
+        def send(method: str, path: str, body: Optional[list]) -> int:
+            request = urllib.request.Request(
+                f"http://{host}:{port}{path}",
+                data=b'' if body is None and method == 'POST' else body and json.dumps(body).encode(),
+                headers={'Content-Type': 'application/json'},
+                method=method,
+            )
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    return response.status
+            except urllib.error.HTTPError as exc:
+                return exc.code
+
+        return send
+
+    def run_endpoint(self, endpoint: Endpoint, send: Callable, counter: QueryCounter, options: dict) -> dict:
+        def request(seed: int) -> tuple:
+            path, body = endpoint.build(random.Random(seed))
+            started_at = time.perf_counter()
+            status_code = send(endpoint.method, path, body)
+            return status_code, time.perf_counter() - started_at
+
+        total = options['requests']
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(request, range(-options['warmup'], 0)))
+            counter.count = 0
+            started_at = time.perf_counter()
+            results = list(executor.map(request, range(total)))
+            elapsed = time.perf_counter() - started_at
+
+        latencies = [latency for _, latency in results]
+        result = {
+            'endpoint': endpoint.label,
+            'method': endpoint.method,
+            'requests': total,
+            'errors': sum(1 for status_code, _ in results if status_code >= 400),
+            'throughput': total / elapsed,
+            'latency_ms': {f'p{q}': percentile(latencies, q) * 1000 for q in (50, 95, 99)},
+            'queries_per_request': counter.count / total,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        self.stdout.write(
+            f"{result['endpoint']:<44} {result['throughput']:>8,.0f} req/s  "
+            f"p50 {result['latency_ms']['p50']:>7.1f}  p95 {result['latency_ms']['p95']:>7.1f}  "
+            f"p99 {result['latency_ms']['p99']:>7.1f} ms  {result['queries_per_request']:>5.1f} queries  "
+            f"{result['errors']} errors  {result['peak_rss_mb']:,.0f} MiB"
+        )
+        return result
+
+    def compare(self, baseline: List[dict], results: List[dict], max_regression: Optional[float]) -> None:
+        baseline = {result['endpoint']: result for result in baseline}
+        regressions = []
+        self.stdout.write("\nChange against baseline:")
+        for result in results:
+            before = baseline.get(result['endpoint'])
+            if before is None:
+                continue
+
+            throughput = (result['throughput'] / before['throughput'] - 1) * 100
+            p99 = (result['latency_ms']['p99'] / before['latency_ms']['p99'] - 1) * 100
+            self.stdout.write(f"{result['endpoint']:<44} throughput {throughput:>+7.1f}%  p99 {p99:>+7.1f}%")
+            if max_regression is not None and (throughput < -max_regression or p99 > max_regression):
+                regressions.append(result['endpoint'])
+
+        if regressions:
+            raise CommandError(f"Regressed by more than {max_regression}%: {', '.join(regressions)}")
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory
+
+from catalog.benchmark import benchmark_database, generate_catalog, measure
+from movies.models import Movie
+from movies.serializers import MovieListSerializer, MovieSerializer
+from planets.models import Planet
+from planets.serializers import PlanetListSerializer, PlanetSerializer
+from utils.fragments import row_fragment_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list serialization throughput of the DRF serializers and their values_list fast path, "
+        "and of JSON encoding with and without the row fragment cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help="Rows per model.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement; the best one is kept.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        with benchmark_database():
+            generate_catalog(movies=rows, planets=rows)
+            request = RequestFactory().get('/')
+            context = {'request': request, "from_list_view": True}
+
+            for model, serializer_class, list_serializer_class in [
+                (Movie, MovieSerializer, MovieListSerializer),
+                (Planet, PlanetSerializer, PlanetListSerializer),
+            ]:
+                def serialize_instances():
+                    return serializer_class(model.objects.all(), many=True, context=context).data
+
+                def serialize_values():
+                    list_serializer = list_serializer_class(request)
+                    return list(list_serializer.to_representations(list_serializer.get_rows(model.objects.all())))
+
+                def serialize_sparse_values():
+                    list_serializer = list_serializer_class(request, fields=('name', 'url'))
+                    return list(list_serializer.to_representations(list_serializer.get_rows(model.objects.all())))
+
+                def encode_values():
+                    return [DjangoJSONEncoder().encode(representation) for representation in serialize_values()]
+
+                def encode_cached_rows():
+                    list_serializer = list_serializer_class(request)
+                    return list(list_serializer.to_encoded_rows(list_serializer.get_rows(model.objects.all())))
+
+                before = measure(serialize_instances, repeat)
+                after = measure(serialize_values, repeat)
+                sparse = measure(serialize_sparse_values, repeat)
+                self.stdout.write(
+                    f"{model.__name__:<8} {rows} rows  "
+                    f"{serializer_class.__name__}: {rows / before:>10,.0f} rows/s  "
+                    f"{list_serializer_class.__name__}: {rows / after:>10,.0f} rows/s  "
+                    f"({before / after:.1f}x)  "
+                    f"?fields=name,url: {rows / sparse:>10,.0f} rows/s ({before / sparse:.1f}x)"
+                )
+
+                encoded = measure(encode_values, repeat)
+                encode_cached_rows()
+                cached = measure(encode_cached_rows, repeat)
+                self.stdout.write(
+                    f"{'':<8} {rows} rows  JSON: {rows / encoded:>10,.0f} rows/s  "
+                    f"cached row fragments: {rows / cached:>10,.0f} rows/s ({encoded / cached:.1f}x)  "
+                    f"{row_fragment_cache.stats()}"
+                )
@@ -0,0 +1,87 @@
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client, override_settings
+
+from catalog.benchmark import benchmark_database, generate_catalog, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare error rate and p99 latency of stock SQLite and SQLITE_PROFILE under concurrent "
+        "list reads, favorites and bulk writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000, help="Movies in the catalog.")
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per profile.")
+        parser.add_argument('--concurrency', type=int, default=16, help="Client threads.")
+        parser.add_argument('--write-ratio', type=float, default=0.3, help="Share of requests that write.")
+
+    def handle(self, *args, **options):
+        # Lock errors are counted, not logged one traceback at a time.
+        logging.getLogger('django.request').disabled = True
+        for profile, enabled in [('stock', False), ('production', True)]:
+            with tempfile.TemporaryDirectory() as directory, override_settings(
+                SQLITE_PROFILE={**settings.SQLITE_PROFILE, 'ENABLED': enabled},
+                CACHES={
+                    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                    'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+                },
+            ), benchmark_database(name=os.path.join(directory, 'benchmark.sqlite3')):
+                generate_catalog(movies=options['rows'], planets=0)
+                connection.close()
+
+                conn_max_age = connection.settings_dict['CONN_MAX_AGE']
+                connection.settings_dict['CONN_MAX_AGE'] = settings.SQLITE_PROFILE['CONN_MAX_AGE'] if enabled else 0
+                try:
+                    self.stdout.write(f"{profile:<11} {self.run(options)}")
+                finally:
+                    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+    @staticmethod
+    def run(options: dict) -> str:
+        rows, write_ratio = options['rows'], options['write_ratio']
+        local = threading.local()
+
+        def request(seed: int) -> tuple:
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            rng, client = random.Random(seed), local.client
+
+            started_at = time.perf_counter()
+            if rng.random() >= write_ratio:
+                response = client.get('/movies/', {'limit': 50, 'ordering': 'name'})
+            elif rng.random() < 0.5:
+                response = client.post(f'/movies/{rng.randrange(1, rows + 1)}/favorite/')
+            elif rng.random() < 0.5:
+                ids = [{"id": rng.randrange(1, rows + 1)} for _ in range(20)]
+                response = client.post('/movies/favorite/', ids, content_type='application/json')
+            else:
+                movies = [{"name": f"Bulk {seed} {index}", "release_date": "2022-05-01"} for index in range(20)]
+                response = client.post('/movies/bulk/', movies, content_type='application/json')
+            return response.status_code, time.perf_counter() - started_at
+
+        def close_connections(_) -> None:
+            connections.close_all()
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(request, range(options['requests'])))
+            list(executor.map(close_connections, range(options['concurrency'])))
+        elapsed = time.perf_counter() - started_at
+
+        errors = sum(1 for status_code, _ in results if status_code >= 500)
+        p99 = percentile([latency for _, latency in results], 99)
+        return (
+            f"{len(results) / elapsed:>7,.0f} requests/s  errors {errors / len(results):>6.1%}  "
+            f"p99 {p99 * 1000:>8.1f} ms"
+        )
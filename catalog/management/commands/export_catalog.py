@@ -0,0 +1,56 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from movies.models import Movie
+from movies.serializers import MovieSerializer
+from planets.models import Planet
+from planets.serializers import PlanetSerializer
+from utils.export import EXPORT_CONTENT_TYPES, get_export_columns, iter_export
+from utils.search import search_queryset
+
+MODELS = {
+    'movies': (Movie, MovieSerializer),
+    'planets': (Planet, PlanetSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream movies or planets as NDJSON or CSV, like the /<model>/export.<format> endpoints, "
+        "in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(MODELS))
+        parser.add_argument('--format', choices=sorted(EXPORT_CONTENT_TYPES), default='ndjson')
+        parser.add_argument('--output', default=None, help="File to write; standard output if omitted.")
+        parser.add_argument('--name', default=None, help="Only rows whose name contains this.")
+        parser.add_argument(
+            '--updated-since', default=None,
+            help="Only rows updated at or after this ISO 8601 datetime, e.g. the last exported updated_at.",
+        )
+
+    def handle(self, *args, **options):
+        model, serializer_class = MODELS[options['model']]
+        queryset = model.objects.all()
+        if options['name']:
+            queryset = search_queryset(queryset, 'name', options['name'])
+        if options['updated_since']:
+            try:
+                updated_since = serializers.DateTimeField().to_internal_value(options['updated_since'])
+            except serializers.ValidationError as exc:
+                raise CommandError(f"--updated-since: {' '.join(exc.detail)}")
+            queryset = queryset.filter(updated_at__gte=updated_since)
+        queryset = queryset.order_by('updated_at', 'id')
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in iter_export(queryset, get_export_columns(serializer_class), options['format']):
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
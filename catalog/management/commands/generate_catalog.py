@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.benchmark import generate_catalog
+from movies.models import Movie
+from planets.models import Planet
+from utils.signals import bulk_write
+
+
+class Command(BaseCommand):
+    help = "Bulk insert a synthetic catalog of movies and planets (10k to 10M rows) into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=10_000, help="Movies to insert.")
+        parser.add_argument('--planets', type=int, default=10_000, help="Planets to insert.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per INSERT statement.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the generated names and flags.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            generate_catalog(
+                movies=options['movies'], planets=options['planets'],
+                batch_size=options['batch_size'], seed=options['seed'],
+            )
+            for model in (Movie, Planet):
+                bulk_write.send(sender=model, pks=None)
+
+        self.stdout.write(f"Inserted {options['movies']} movies and {options['planets']} planets.")
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.importer import (CatalogImporter, detect_format,
+                              iter_json_records, iter_ndjson_records)
+from movies.serializers import MovieSerializer
+from planets.serializers import PlanetSerializer
+
+SERIALIZERS = {
+    'movies': MovieSerializer,
+    'planets': PlanetSerializer,
+}
+
+# Invalid records reported in full; the rest are only counted.
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert movies or planets by name from a JSON array or NDJSON dump (e.g. SWAPI), streaming the file "
+        "in constant memory and committing one batch at a time; an interrupted import resumes from its checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(SERIALIZERS), help="What the dump contains.")
+        parser.add_argument('path', help="JSON array or NDJSON file.")
+        parser.add_argument('--format', choices=('auto', 'json', 'ndjson'), default='auto')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.BULK_WRITE['BATCH_SIZE'],
+            help="Records validated and committed together.",
+        )
+        parser.add_argument('--checkpoint', default=None, help="Checkpoint file; <path>.<model>.checkpoint if omitted.")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint.")
+        parser.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress lines.")
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        if not os.path.isfile(path):
+            raise CommandError(f"No such file: {path}")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        checkpoint_path = options['checkpoint'] or f"{path}.{options['model']}.checkpoint"
+        start = 0 if options['restart'] else self.read_checkpoint(checkpoint_path, path, options['model'])
+        if start:
+            self.stdout.write(f"Resuming after record {start} from {checkpoint_path}.")
+
+        importer = CatalogImporter(SERIALIZERS[options['model']], options['batch_size'])
+        reported_errors = 0
+        started_at = last_progress_at = time.perf_counter()
+        index = start
+
+        with open(path, encoding='utf-8') as file:
+            file_format = detect_format(file) if options['format'] == 'auto' else options['format']
+            iter_records = iter_json_records if file_format == 'json' else iter_ndjson_records
+            try:
+                for index in importer.import_records(iter_records(file, skip=start), first_index=start):
+                    self.write_checkpoint(checkpoint_path, path, options['model'], index)
+
+                    for error in importer.errors[:max(0, MAX_REPORTED_ERRORS - reported_errors)]:
+                        self.stderr.write(f"Skipped invalid record {error.pop('index')}: {json.dumps(error)}")
+                    reported_errors += len(importer.errors)
+
+                    now = time.perf_counter()
+                    if now - last_progress_at >= options['progress_interval']:
+                        last_progress_at = now
+                        self.stdout.write(self.format_progress(importer, index - start, now - started_at))
+            except ValueError as exc:
+                raise CommandError(f"{exc} (after record {index}; rerun to resume from there).")
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.format_progress(importer, index - start, time.perf_counter() - started_at))
+        self.stdout.write(self.style.SUCCESS(f"Imported {options['model']} from {path}."))
+
+    @staticmethod
+    def format_progress(importer: CatalogImporter, records: int, elapsed: float) -> str:
+        stats = importer.stats
+        return (
+            f"{records:,} records in {elapsed:,.1f}s ({records / max(elapsed, 1e-9):,.0f} records/s): "
+            f"{stats['created']:,} created, {stats['updated']:,} updated, "
+            f"{stats['unchanged']:,} unchanged, {stats['invalid']:,} invalid"
+        )
+
+    @staticmethod
+    def read_checkpoint(checkpoint_path: str, path: str, model: str) -> int:
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as file:
+            checkpoint = json.load(file)
+        if checkpoint['path'] != path or checkpoint['model'] != model:
+            raise CommandError(f"{checkpoint_path} belongs to another import; pass --restart to ignore it.")
+        return checkpoint['records']
+
+    @staticmethod
+    def write_checkpoint(checkpoint_path: str, path: str, model: str, records: int) -> None:
+        # Replaced atomically, so a crash never leaves a torn checkpoint behind.
+        with open(f"{checkpoint_path}.tmp", 'w') as file:
+            json.dump({'path': path, 'model': model, 'records': records}, file)
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
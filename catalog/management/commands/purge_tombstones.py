@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog.feed import tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of the /changes/ feeds older than CHANGE_FEED['RETENTION_DAYS']; "
+        "clients with older watermarks get a 410 and resync anyway."
+    )
+
+    def handle(self, *args, **options):
+        deleted = tombstones.purge()
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {deleted} tombstones older than {settings.CHANGE_FEED['RETENTION_DAYS']} days."
+        ))
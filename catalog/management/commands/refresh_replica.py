@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.replica import refresh_replica
+
+
+class Command(BaseCommand):
+    help = "Copy the default SQLite database onto the read replica, once or every --interval seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help=f"Seconds between refreshes, e.g. {settings.READ_REPLICA['REFRESH_INTERVAL']}; runs once if omitted.",
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            started_at = time.perf_counter()
+            refresh_replica()
+            self.stdout.write(f"Replica refreshed in {(time.perf_counter() - started_at) * 1000:.0f} ms.")
+            if interval is None:
+                return
+            time.sleep(max(0.0, interval - (time.perf_counter() - started_at)))
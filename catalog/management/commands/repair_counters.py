@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from catalog.counters import catalog_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the catalog statistics counters from the movies and planets tables and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report the drift, keep the stored counters.")
+
+    def handle(self, *args, **options):
+        drift = catalog_counters.repair(dry_run=options['dry_run'])
+        for key, (stored, actual) in drift.items():
+            self.stdout.write(f"{key}: stored {stored}, actual {actual} ({actual - stored:+d})")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Counters are up to date."))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} counters drifted; run without --dry-run to fix them."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} counters."))
@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from movies.models import Movie
+from planets.models import Planet
+from utils.objects import object_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Preload the hottest movies and planets (favorites first, then the most recently updated) into the "
+        "object cache of the current process. The cache is per process, so run it in every worker at start: "
+        "WARM_OBJECT_CACHE=1 does that from the WSGI/ASGI application."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=settings.OBJECT_CACHE['WARM_ROWS'], help="Rows preloaded per model."
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        for model in (Movie, Planet):
+            started_at = time.perf_counter()
+            instances = object_cache.load_many(model, lambda: self.read_rows(model, rows))
+            self.stdout.write(
+                f"Preloaded {len(instances)} {model._meta.verbose_name_plural} "
+                f"in {(time.perf_counter() - started_at) * 1000:.0f} ms."
+            )
+
+    @staticmethod
+    def read_rows(model, rows: int) -> list:
+        # Both read along an index: the favorites' partial one and the one on `updated_at`.
+        instances = list(model.objects.filter(is_favorite=True).order_by('-created_at')[:rows])
+        if len(instances) < rows:
+            instances += model.objects.filter(is_favorite__in=[False]).order_by('-updated_at')[:rows - len(instances)]
+        return instances
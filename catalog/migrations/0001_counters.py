@@ -0,0 +1,47 @@
+# Generated by Django 4.0.4 on 2026-10-18 13:49
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+
+
+def count_catalog(apps, schema_editor):
+    CatalogCounter = apps.get_model('catalog', 'CatalogCounter')
+    counts = {}
+    for label, model_name, histogram_field in (
+        ('movies.movie', 'movies.Movie', 'release_date'),
+        ('planets.planet', 'planets.Planet', None),
+    ):
+        model = apps.get_model(model_name)
+        aggregate = model.objects.aggregate(total=Count('pk'), favorites=Count('pk', filter=Q(is_favorite=True)))
+        counts[f"{label}:total"] = aggregate['total']
+        counts[f"{label}:favorites"] = aggregate['favorites']
+        if histogram_field:
+            years = model.objects.annotate(year=ExtractYear(histogram_field)).values_list('year')
+            for year, count in years.annotate(count=Count('pk')).order_by():
+                if year is not None:
+                    counts[f"{label}:{histogram_field}:{year}"] = count
+    CatalogCounter.objects.bulk_create(
+        [CatalogCounter(key=key, value=value) for key, value in counts.items() if value]
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('movies', '0003_indexes'),
+        ('planets', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogCounter',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_catalog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from catalog.counters import CreateCounterTriggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_tombstones'),
+    ]
+
+    operations = [
+        CreateCounterTriggers(model='movies.Movie', histogram_field='release_date'),
+        CreateCounterTriggers(model='planets.Planet'),
+    ]
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class CatalogCounter(models.Model):
+    """
+    One running total of the catalog statistics, e.g. ``movies.movie:total``,
+    ``movies.movie:favorites`` or ``movies.movie:release_date:1977``; see
+    ``catalog.counters``.
+    """
+
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return "{} = {}".format(self.key, self.value)
+
+
+class Tombstone(models.Model):
+    """
+    A deleted catalog row, kept so that the ``/changes/`` feeds can tell
+    clients to drop it; see ``catalog.feed``.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'object_id'], name='tombstone_model_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return "{} {} deleted at {}".format(self.model, self.object_id, self.deleted_at)
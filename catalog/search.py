@@ -0,0 +1,54 @@
+from typing import Callable, List, NamedTuple
+
+from django.db import models
+from django.db.models import Case, QuerySet, Value, When
+
+from movies.models import Movie
+from planets.models import Planet
+from utils.search import search_queryset
+
+
+class SearchedModel(NamedTuple):
+    type: str
+    model: type
+    detail_url_name: str
+
+
+SEARCHED_MODELS = (
+    SearchedModel('movie', Movie, 'movie_detail'),
+    SearchedModel('planet', Planet, 'planet_detail'),
+)
+DETAIL_URL_NAMES = {searched.type: searched.detail_url_name for searched in SEARCHED_MODELS}
+
+# Result columns, in the order of the UNION's select list.
+RESULT_COLUMNS = ('type', 'id', 'name', 'is_favorite')
+
+
+def _search_part(searched: SearchedModel, term: str, filter_queryset: Callable) -> QuerySet:
+    queryset = search_queryset(filter_queryset(searched.model.objects.all()), 'name', term)
+    if 'search_rank' not in queryset.query.extra_select:
+        # Terms too short for the trigram index have no bm25 rank.
+        queryset = queryset.extra(select={'search_rank': '0'})
+    return queryset.annotate(
+        type=Value(searched.type, output_field=models.CharField()),
+        match=Case(
+            When(name__iexact=term, then=Value(0)),
+            When(name__istartswith=term, then=Value(1)),
+            default=Value(2),
+        ),
+    ).values_list(*RESULT_COLUMNS, 'match', 'search_rank').order_by()
+
+
+def search_catalog(term: str, limit: int, filter_queryset: Callable = lambda queryset: queryset) -> List[tuple]:
+    """
+    The ``limit`` best ``RESULT_COLUMNS`` rows of every searched model whose
+    name contains ``term``, in one ``UNION ALL`` query.
+
+    Each part narrows its rows with its own trigram index (see
+    ``search_queryset``); results are ranked by exact name, then name prefix,
+    then the bm25 rank of their index, and ties keep the models' order.
+    ``filter_queryset`` narrows each model's queryset first.
+    """
+    first, *others = (_search_part(searched, term, filter_queryset) for searched in SEARCHED_MODELS)
+    results = first.union(*others, all=True).order_by('match', 'search_rank', 'type', 'id')[:limit]
+    return [row[:len(RESULT_COLUMNS)] for row in results]
@@ -0,0 +1,738 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import JsonResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+from rest_framework import status
+
+from catalog import importer
+from catalog.counters import catalog_counters
+from catalog.feed import encode_watermark, tombstones
+from catalog.models import CatalogCounter, Tombstone
+from movies.async_views import MovieAsyncDetailView
+from movies.models import Movie
+from planets.models import Planet
+from utils.autocomplete import MERGE_THRESHOLD, autocomplete_index
+from utils.cache import response_cache
+from utils.fragments import row_fragment_cache
+from utils.objects import object_cache
+from utils.replica import (STICKY_COOKIE_NAME, ReplicaRouter,
+                           is_reading_from_replica)
+from utils.signals import bulk_write
+from utils.sqlite import apply_pragmas, write_lock
+from utils.testing import CatalogAPITestCase
+from utils.timing import execute_wrapper
+
+
+class ResponseCacheTest(CatalogAPITestCase):
+
+    def test_list_response_is_served_from_cache_until_a_write__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        response = self.client.get(reverse('movies_list'))
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(reverse('movies_list'))
+        self.assertEqual(cached_response.headers['X-Cache'], 'HIT')
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response.headers['ETag'], response.headers['ETag'])
+        self.assertEqual(cached_response.headers['Content-Type'], 'application/json')
+
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        response = self.client.get(reverse('movies_list'))
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertTrue(json.loads(response.content)['movies'][0]['is_favorite'])
+
+    def test_query_parameters_are_normalized_in_cache_key__success(self):
+        Planet.objects.create(name="Hoth")
+
+        response = self.client.get(f"{reverse('planets_list')}?name=hoth&limit=5")
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+
+        response = self.client.get(f"{reverse('planets_list')}?limit=5&name=hoth")
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+
+        response = self.client.get(f"{reverse('planets_list')}?limit=5&name=oth")
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+
+    def test_generation_is_per_model_and_bumped_by_bulk_writes__success(self):
+        self.client.get(reverse('movies_list'))
+        self.client.get(reverse('planets_list'))
+
+        Planet.objects.bulk_create([Planet(name="Hoth")])
+        bulk_write.send(sender=Planet, pks=[1])
+
+        self.assertEqual(self.client.get(reverse('movies_list')).headers['X-Cache'], 'HIT')
+        response = self.client.get(reverse('planets_list'))
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(json.loads(response.content)['planets']), 1)
+
+    def test_cached_response_honours_conditional_get__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        etag = self.client.get(reverse('movie_detail', args=(1,))).headers['ETag']
+
+        response = self.client.get(reverse('movie_detail', args=(1,)), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+
+    def test_cache_stats__success(self):
+        self.client.get(reverse('movies_list'))
+        self.client.get(reverse('movies_list'))
+
+        response = self.client.get(reverse('response_cache_stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Response cache stats fetched successfully.")
+        self.assertEqual(response_body['details'], {"hits": 1, "misses": 1, "evictions": 0})
+
+
+class LRUMemoryCacheTest(CatalogAPITestCase):
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'responses': {
+            'BACKEND': 'utils.cache.LRUMemoryCache',
+            'LOCATION': 'lru-test',
+            'OPTIONS': {'MAX_ENTRIES': 100, 'MAX_BYTES': 1000},
+        },
+    })
+    def test_least_recently_used_entries_are_evicted_by_size__success(self):
+        cache = caches['responses']
+        cache.clear()
+
+        cache.set('a', b'x' * 400)
+        cache.set('b', b'x' * 400)
+        cache.get('a')
+        cache.set('c', b'x' * 400)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.size, 1000)
+
+        cache.delete('a')
+        cache.delete('c')
+        self.assertEqual(cache.size, 0)
+
+
+class RowFragmentCacheTest(CatalogAPITestCase):
+
+    def test_least_recently_used_rows_are_evicted_and_writes_drop_rows__success(self):
+        cache = row_fragment_cache
+        fragment = 'x' * 300
+        keys = [('movies.movie', pk, None, ()) for pk in range(3)]
+
+        with override_settings(ROW_FRAGMENT_CACHE={'MAX_BYTES': 1000}):
+            cache.set_many({keys[0]: fragment, keys[1]: fragment})
+            cache.get_many([keys[0]])
+            cache.set_many({keys[2]: fragment})
+        self.assertEqual(cache.get_many(keys), [fragment, None, fragment])
+        self.assertEqual(cache.evictions, 1)
+
+        bulk_write.send(sender=Movie, pks=[0])
+        bulk_write.send(sender=Movie, pks=None)
+        self.assertEqual(cache.get_many(keys), [None, None, fragment])
+        self.assertEqual(cache.stats()['entries'], 1)
+
+        cache.invalidate(Movie, [2])
+        self.assertEqual(cache.size, 0)
+
+
+class SQLiteProfileTest(CatalogAPITestCase):
+
+    def test_pragmas_are_applied_to_connection__success(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dbapi_connection = sqlite3.connect(os.path.join(directory, 'profile.sqlite3'))
+            try:
+                apply_pragmas(dbapi_connection, settings.SQLITE_PROFILE['PRAGMAS'])
+                self.assertEqual(dbapi_connection.execute("PRAGMA journal_mode").fetchone(), ('wal',))
+                self.assertEqual(dbapi_connection.execute("PRAGMA synchronous").fetchone(), (1,))
+                self.assertEqual(dbapi_connection.execute("PRAGMA busy_timeout").fetchone(), (5000,))
+            finally:
+                dbapi_connection.close()
+
+    def test_write_lock_queues_writers_when_profile_is_enabled__success(self):
+        writers = []
+
+        def write():
+            with write_lock:
+                writers.append(threading.current_thread().name)
+
+        with override_settings(SQLITE_PROFILE={**settings.SQLITE_PROFILE, 'ENABLED': True}):
+            with write_lock, write_lock:
+                thread = threading.Thread(target=write, name='writer')
+                thread.start()
+                thread.join(timeout=0.1)
+                self.assertEqual(writers, [])
+            thread.join()
+        self.assertEqual(writers, ['writer'])
+
+        with write_lock:
+            thread = threading.Thread(target=write, name='unqueued')
+            thread.start()
+            thread.join()
+        self.assertEqual(writers, ['writer', 'unqueued'])
+
+
+@override_settings(READ_REPLICA={**settings.READ_REPLICA, 'ENABLED': True})
+class ReadReplicaTest(CatalogAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        # The in-memory test database cannot be mirrored through a second connection while a test
+        # transaction is open, so record where reads are routed and run them on `default`.
+        self.routed_reads = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def record_db_for_read(router, model, **hints):
+            self.routed_reads.append(db_for_read(router, model, **hints))
+
+        patcher = mock.patch.object(ReplicaRouter, 'db_for_read', record_db_for_read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_of_opted_in_views_go_to_replica__success(self):
+        self.client.get(reverse('movies_list'))
+        self.client.get(reverse('planet_detail', args=(1,)))
+        self.assertEqual(set(self.routed_reads), {'replica'})
+
+        self.routed_reads.clear()
+        self.client.get(reverse('response_cache_stats'))
+        Movie.objects.count()
+        self.assertEqual(set(self.routed_reads), {None})
+
+    def test_streamed_lists_are_read_from_replica__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Planet.objects.create(name="Hoth")
+
+        for key in ('movies', 'planets'):
+            response = self.client.get(reverse(f'{key}_list'), {'stream': 'true'})
+            # The rows are only read here, once the middleware has reset the routing.
+            self.assertEqual(len(json.loads(b"".join(response.streaming_content))[key]), 1)
+        self.assertEqual(set(self.routed_reads), {'replica'})
+
+    def test_reads_stick_to_default_after_a_write__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        response = self.client.post(reverse('movie_favorite', args=(1,)))
+        self.assertIn(STICKY_COOKIE_NAME, response.cookies)
+        self.assertEqual(response.cookies[STICKY_COOKIE_NAME]['max-age'], settings.READ_REPLICA['STICKY_SECONDS'])
+
+        self.routed_reads.clear()
+        response = self.client.get(reverse('movie_detail', args=(1,)))
+        self.assertEqual(set(self.routed_reads), {None})
+        self.assertTrue(json.loads(response.content)['details']['is_favorite'])
+
+    def test_clients_reading_from_default_skip_cached_replica_reads__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        for url in (reverse('movies_list'), reverse('movie_detail', args=(1,))):
+            self.client.cookies.pop(STICKY_COOKIE_NAME, None)
+            self.assertEqual(self.client.get(url).headers['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(url).headers['X-Cache'], 'HIT')
+
+            self.client.cookies[STICKY_COOKIE_NAME] = '1'
+            self.routed_reads.clear()
+            self.assertEqual(self.client.get(url).headers['X-Cache'], 'MISS')
+            # Read again from `default`: the detail view's object cache skips the replica's row too.
+            self.assertEqual(set(self.routed_reads), {None})
+            self.assertEqual(self.client.get(url).headers['X-Cache'], 'HIT')
+
+    @override_settings(SERVER_TIMING={'SAMPLE_RATE': 1.0})
+    async def test_async_requests_are_served_concurrently__success(self):
+        replica_reads = []
+
+        async def get(view, request, id):
+            replica_reads.append(is_reading_from_replica())
+            await asyncio.sleep(0.1)
+            return JsonResponse({'id': id})
+
+        with mock.patch.object(MovieAsyncDetailView, 'get', get), self.assertLogs('utils.timing', level='INFO') as logs:
+            started_at = time.perf_counter()
+            responses = await asyncio.gather(*(
+                self.async_client.get(reverse('movie_detail_async', args=(index,))) for index in range(20)
+            ))
+            elapsed = time.perf_counter() - started_at
+
+        self.assertEqual([response.status_code for response in responses], [200] * 20)
+        self.assertEqual(len(logs.records), 20)
+        self.assertEqual(replica_reads, [True] * 20)
+        # One after the other, the 20 sleeps alone would take 2 seconds.
+        self.assertLess(elapsed, 1.0)
+
+
+class QueryPlanTest(CatalogAPITestCase):
+    # Every list variant except the unfiltered, unpaginated one (which returns the whole table)
+    # and name searches shorter than the search index's trigrams.
+    list_params = [
+        {'limit': 2},
+        {'limit': 2, 'ordering': 'name'},
+        {'limit': 2, 'is_favorite': 'true'},
+        {'limit': 2, 'is_favorite': 'false'},
+        {'limit': 2, 'is_favorite': 'true', 'ordering': 'name'},
+        {'limit': 2, 'is_favorite': 'false', 'ordering': 'name'},
+        {'limit': 2, 'name': 'hope'},
+        {'is_favorite': 'true'},
+        {'is_favorite': 'true', 'name': 'hope'},
+        {'ids': '4,2,9'},
+        {'ids': '4,2,9', 'is_favorite': 'true', 'fields': 'name'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            Movie.objects.create(name=f"A New Hope {index}", release_date="1977-05-25", is_favorite=index % 2)
+            Planet.objects.create(name=f"Hope {index}", is_favorite=index % 2)
+
+    def get_full_scans(self, sql: str) -> list:
+        """Plan steps that read a whole table, or sort a whole filtered set that is not a search result."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            details = [row[-1] for row in cursor.fetchall()]
+        return [
+            detail for detail in details
+            if re.fullmatch(r'SCAN \w+', detail) or (detail.startswith('USE TEMP B-TREE') and ' MATCH ' not in sql)
+        ]
+
+    def test_list_queries_use_indexes__success(self):
+        for url_name in ('movies_list', 'planets_list'):
+            for params in self.list_params:
+                url = f"{reverse(url_name)}?{urlencode(params)}"
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                    next_cursor = json.loads(response.content).get('next')
+                    if next_cursor:
+                        self.client.get(f"{url}&{urlencode({'cursor': next_cursor})}")
+
+                self.assertGreater(len(queries), 0)
+                for query in queries:
+                    with self.subTest(url=url, sql=query['sql']):
+                        self.assertEqual(self.get_full_scans(query['sql']), [])
+
+    @override_settings(CHANGE_FEED={'SETTLE_SECONDS': 0, 'RETENTION_DAYS': 30})
+    def test_change_feed_queries_use_indexes__success(self):
+        Movie.objects.filter(id=3).delete()
+        watermark = encode_watermark(timezone.now() - timedelta(hours=1), 2)
+        for url_name in ('movies_changes', 'planets_changes'):
+            url = f"{reverse(url_name)}?{urlencode({'since': watermark, 'limit': 2})}"
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+            self.assertGreater(len(queries), 0)
+            for query in queries:
+                with self.subTest(url=url, sql=query['sql']):
+                    self.assertEqual(self.get_full_scans(query['sql']), [])
+
+        call_command('purge_tombstones', stdout=StringIO())
+        self.assertEqual(Tombstone.objects.count(), 1)
+        tombstones.purge(older_than=timezone.now())
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_catalog_search_query_uses_indexes__success(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('catalog_search'), {'name': 'hope', 'is_favorite': 'true'})
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.get_full_scans(queries[0]['sql']), [])
+
+
+class ServerTimingTest(CatalogAPITestCase):
+
+    @override_settings(SERVER_TIMING={'SAMPLE_RATE': 1.0})
+    def test_sampled_request_reports_timings__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        with self.assertLogs('utils.timing', level='INFO') as logs:
+            response = self.client.get(reverse('movies_list'))
+
+        metrics = [metric.split(';')[0] for metric in response.headers['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['db', 'serialize', 'encode', 'total'])
+        self.assertIn('db;dur=', response.headers['Server-Timing'])
+        self.assertIn('desc="2 queries"', response.headers['Server-Timing'])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(
+            {key: record[key] for key in ('method', 'path', 'status', 'queries')},
+            {'method': 'GET', 'path': reverse('movies_list'), 'status': 200, 'queries': 2},
+        )
+        self.assertGreaterEqual(record['total_ms'], record['encode_ms'])
+
+        # Rows already in the fragment cache are neither serialized nor encoded again.
+        with self.assertLogs('utils.timing', level='INFO'):
+            response = self.client.get(reverse('movies_list'), {'ordering': 'name'})
+        metrics = [metric.split(';')[0] for metric in response.headers['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['db', 'encode', 'total'])
+
+    @override_settings(SERVER_TIMING={'SAMPLE_RATE': 1.0})
+    async def test_sampled_async_request_reports_timings__success(self):
+        await sync_to_async(Movie.objects.create)(name="A New Hope", release_date="1977-05-25")
+
+        with self.assertLogs('utils.timing', level='INFO') as logs:
+            response = await self.async_client.get(reverse('movies_list_async'))
+
+        self.assertIn('desc="2 queries"', response.headers['Server-Timing'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
+
+    def test_wrapper_survives_connections_opened_inside_execute_wrapper__success(self):
+        def caller_wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        new_connection = connections.create_connection('default')
+        self.addCleanup(new_connection.close)
+        with new_connection.execute_wrapper(caller_wrapper):
+            new_connection.ensure_connection()
+        self.assertEqual(new_connection.execute_wrappers, [execute_wrapper])
+
+    def test_unsampled_request_has_no_timings__success(self):
+        response = self.client.get(reverse('movies_list'))
+        self.assertNotIn('Server-Timing', response.headers)
+
+
+class ImportCatalogTest(CatalogAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_dump(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def import_catalog(self, *args) -> str:
+        stdout = StringIO()
+        call_command('import_catalog', *args, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_json_records_are_decoded_across_read_boundaries__success(self):
+        records = [{"name": f"Hoth {index}", "climate": "frozen \u2744"} for index in range(50)]
+        path = self.write_dump('planets.json', f" [ {json.dumps(records, indent=1)[1:-1]} ] ")
+
+        with mock.patch.object(importer, 'READ_SIZE', 7), open(path) as file:
+            self.assertEqual(list(importer.iter_json_records(file)), records)
+        with open(path) as file:
+            self.assertEqual(list(importer.iter_json_records(file, skip=48)), records[48:])
+
+        path = self.write_dump('bad.json', '[{"a": 1} {"b": 2}]')
+        with mock.patch.object(importer, 'READ_SIZE', 7), open(path) as file:
+            with self.assertRaisesMessage(ValueError, "expected ',' or ']'"):
+                list(importer.iter_json_records(file))
+
+    def test_import_upserts_by_name_and_skips_invalid_records__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-01-01", is_favorite=True)
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        path = self.write_dump('films.json', json.dumps([
+            {"model": "resources.film", "pk": pk, "fields": fields} for pk, fields in enumerate([
+                {"title": "A New Hope", "release_date": "1977-05-25"},
+                {"title": "The Empire Strikes Back", "release_date": "1980-05-17"},
+                {"title": "Return of the Jedi", "release_date": "1983-05-25"},
+                {"title": "Undated"},
+            ], start=1)
+        ]))
+
+        output = self.import_catalog('movies', path, '--batch-size', '3')
+        self.assertIn("1 created, 1 updated, 1 unchanged, 1 invalid", output)
+        self.assertEqual(
+            list(Movie.objects.order_by('id').values_list('name', 'release_date', 'is_favorite')),
+            [
+                ("A New Hope", date(1977, 5, 25), True),
+                ("Return of the Jedi", date(1983, 5, 25), False),
+                ("The Empire Strikes Back", date(1980, 5, 17), False),
+            ],
+        )
+        self.assertEqual(self.client.get(reverse('movies_list'), {'name': 'empire'}).json()['movies'][0]['name'],
+                         "The Empire Strikes Back")
+        self.assertFalse(os.path.exists(f"{path}.movies.checkpoint"))
+
+    def test_import_resumes_from_checkpoint__success(self):
+        path = self.write_dump('planets.ndjson', "".join(
+            f'{json.dumps({"name": name})}\n\n' for name in ["Tatooine", "Alderaan", "Hoth"]
+        ))
+        with open(f"{path}.planets.checkpoint", 'w') as file:
+            json.dump({'path': path, 'model': 'planets', 'records': 1}, file)
+
+        output = self.import_catalog('planets', path)
+        self.assertIn("Resuming after record 1", output)
+        self.assertEqual(list(Planet.objects.values_list('name', flat=True)), ["Alderaan", "Hoth"])
+
+        self.import_catalog('planets', path, '--restart')
+        self.assertEqual(sorted(Planet.objects.values_list('name', flat=True)), ["Alderaan", "Hoth", "Tatooine"])
+
+
+class ExportCatalogTest(CatalogAPITestCase):
+
+    def test_export_command_matches_export_endpoint__success(self):
+        Planet.objects.create(name="Hoth")
+        Planet.objects.create(name="Tatooine")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'planets.ndjson')
+            call_command('export_catalog', 'planets', '--output', path, '--name', 'hot')
+            with open(path, 'rb') as file:
+                exported = file.read()
+
+        response = self.client.get(reverse('planets_export', args=('ndjson',)), {'name': 'hot'})
+        self.assertEqual(exported, b"".join(response.streaming_content))
+        self.assertEqual([json.loads(line)['name'] for line in exported.splitlines()], ["Hoth"])
+
+
+class CatalogStatsTest(CatalogAPITestCase):
+
+    def get_stats(self) -> dict:
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('catalog_stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)['details']
+
+    def test_counters_follow_every_write_path__success(self):
+        self.client.post(reverse('movies_list'), data={"name": "A New Hope", "release_date": "1977-05-25"})
+        self.client.post(reverse('movies_bulk'), data=[
+            {"name": "The Empire Strikes Back", "release_date": "1980-05-17"},
+            {"name": "Return of the Jedi", "release_date": "1983-05-25", "is_favorite": True},
+        ], format='json')
+        Planet.objects.create(name="Hoth")
+        Planet.objects.create(name="Tatooine")
+
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        self.client.post(reverse('planets_bulk_favorite'), data=[{"id": 1}, {"id": 1}, {"id": 9}], format='json')
+        movie = Movie.objects.get(name="The Empire Strikes Back")
+        movie.release_date = "1977-12-25"
+        movie.save()
+        Movie.objects.filter(name="Return of the Jedi").delete()
+        Movie.objects.filter(name="A New Hope").update(is_favorite=False, release_date="1980-05-17")
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE planets_planet SET is_favorite = 1 WHERE name = 'Tatooine'")
+
+        self.assertEqual(self.get_stats(), {
+            "planets": {"total": 2, "favorites": 2},
+            "movies": {"total": 2, "favorites": 0, "by_release_date_year": {"1977": 1, "1980": 1}},
+        })
+        self.assertEqual(catalog_counters.repair(dry_run=True), {})
+
+    def test_favorite_write_is_counted_without_extra_queries__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        with self.assertNumQueries(1):
+            self.client.post(reverse('movie_favorite', args=(1,)), data={"custom_name": "Episode IV"})
+        with self.assertNumQueries(1):
+            self.client.post(reverse('movie_favorite', args=(1,)), data={"custom_name": "Episode IV"})
+        self.assertEqual(self.get_stats()['movies']['favorites'], 1)
+
+    def test_repair_command_reports_and_fixes_drift__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1980-05-17", is_favorite=True)
+        # Writes made while the triggers were missing.
+        CatalogCounter.objects.filter(key="movies.movie:favorites").delete()
+        CatalogCounter.objects.filter(key="movies.movie:release_date:1980").update(key="movies.movie:release_date:1977")
+
+        stdout = StringIO()
+        call_command('repair_counters', '--dry-run', stdout=stdout)
+        self.assertEqual(stdout.getvalue().splitlines()[:3], [
+            "movies.movie:favorites: stored 0, actual 1 (+1)",
+            "movies.movie:release_date:1977: stored 1, actual 0 (-1)",
+            "movies.movie:release_date:1980: stored 0, actual 1 (+1)",
+        ])
+        self.assertEqual(self.get_stats()['movies']['favorites'], 0)
+
+        call_command('repair_counters', stdout=StringIO())
+        self.assertEqual(self.get_stats()['movies'], {
+            "total": 1, "favorites": 1, "by_release_date_year": {"1980": 1},
+        })
+
+
+class CatalogSearchTest(CatalogAPITestCase):
+
+    def search(self, **params) -> dict:
+        response = self.client.get(reverse('catalog_search'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_search_movies_and_planets_in_one_query__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Hoth Holiday Special", release_date="1978-11-17", is_favorite=True)
+        Planet.objects.create(name="Hoth")
+        Planet.objects.create(name="Tatooine")
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.search(name="hoth")
+        self.assertEqual(len(queries), 1)
+        self.assertIn(" UNION ALL ", queries[0]['sql'])
+        self.assertEqual(data, {
+            "msg": "Catalog search results fetched successfully.",
+            "results": [
+                {"type": "planet", "name": "Hoth", "is_favorite": False, "url": "http://testserver/planets/1/"},
+                {
+                    "type": "movie", "name": "Hoth Holiday Special", "is_favorite": True,
+                    "url": "http://testserver/movies/2/",
+                },
+            ],
+        })
+
+        self.assertEqual([result['name'] for result in self.search(name="o", limit=3)['results']], [
+            "A New Hope", "Hoth Holiday Special", "Hoth",
+        ])
+        self.assertEqual([result['type'] for result in self.search(name="ho", is_favorite="true")['results']], [
+            "movie",
+        ])
+        self.assertEqual(self.search(name="endor"), {"msg": "No catalog search results.", "results": []})
+
+    def test_search_without_name__failure(self):
+        response = self.client.get(reverse('catalog_search'), {'name': ' '})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), {"name": ["This query parameter is required."]})
+
+
+class AutocompleteTest(CatalogAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        Movie.objects.create(name="A New Hope", custom_name="Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Hoth Holiday Special", release_date="1978-11-17")
+        Planet.objects.create(name="Hoth")
+
+    def suggest(self, name: str, **params) -> list:
+        response = self.client.get(reverse('catalog_autocomplete'), {'name': name, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['type'], item['field'], item['text']) for item in json.loads(response.content)['suggestions']]
+
+    def test_lookups_do_not_query_once_built__success(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.suggest("ho", limit=2), [
+                ('movie', 'name', "Hoth Holiday Special"), ('movie', 'name', "A New Hope"),
+            ])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest(" HOTH"), [
+                ('planet', 'name', "Hoth"), ('movie', 'name', "Hoth Holiday Special"),
+            ])
+            self.assertEqual(self.suggest("endor"), [])
+            response = self.client.get(reverse('catalog_autocomplete'), {'name': "ho", 'limit': 51})
+        self.assertEqual(json.loads(response.content), {"limit": ["Ensure this value is between 1 and 50."]})
+
+    def test_index_follows_committed_writes__success(self):
+        self.suggest("ho")
+        with self.captureOnCommitCallbacks(execute=True):
+            Planet.objects.create(name="Dagobah")
+            Movie.objects.filter(name="A New Hope").delete()
+            self.client.post(
+                reverse('movies_bulk_favorite'), data=[{"id": 2, "custom_name": "Holidays"}], format='json'
+            )
+            self.client.post(reverse('movies_bulk'), data=[
+                {"name": "The Empire Strikes Back", "release_date": "1980-05-17"},
+            ], format='json')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest("dago"), [('planet', 'name', "Dagobah")])
+            self.assertEqual(self.suggest("hope"), [])
+            self.assertEqual(self.suggest("holidays"), [('movie', 'custom_name', "Holidays")])
+            self.assertEqual(self.suggest("emp"), [('movie', 'name', "The Empire Strikes Back")])
+
+    def test_batches_of_writes_keep_the_index_sorted__success(self):
+        self.suggest("ho")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('planets_bulk'), data=[
+                {"name": f"Outer Rim {index}"} for index in range(MERGE_THRESHOLD)
+            ], format='json')
+        self.assertEqual(len(self.suggest("rim", limit=50)), MERGE_THRESHOLD)
+
+        pks = list(Planet.objects.filter(name__startswith="Outer Rim").values_list('id', flat=True))
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM planets_planet WHERE name LIKE 'Outer Rim%'")
+        autocomplete_index.refresh('planet', pks)
+
+        self.assertEqual(autocomplete_index._entries, sorted(autocomplete_index._entries))
+        self.assertEqual(self.suggest("rim"), [])
+        self.assertEqual(self.suggest("ho"), [
+            ('movie', 'name', "Hoth Holiday Special"), ('movie', 'name', "A New Hope"), ('planet', 'name', "Hoth"),
+        ])
+
+    def test_renaming_a_favorite_is_seen_by_other_processes__success(self):
+        Movie.objects.update(is_favorite=True, updated_at=timezone.now() - timedelta(hours=1))
+        self.suggest("ho")
+
+        # Without running this process's on-commit callbacks, as in another worker.
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(
+                reverse('movies_bulk_favorite'), data=[{"id": 2, "custom_name": "Holidays"}], format='json'
+            )
+        autocomplete_index.sync('movie')
+        self.assertEqual(self.suggest("holidays"), [('movie', 'custom_name', "Holidays")])
+
+    def test_check_catches_up_with_unseen_writes__success(self):
+        self.suggest("ho")
+        Movie.objects.filter(name="A New Hope").update(name="Rogue One", custom_name=None, updated_at=timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM planets_planet")
+
+        self.assertEqual(autocomplete_index.check(), ['planet'])
+        self.assertEqual(self.suggest("rog"), [('movie', 'name', "Rogue One")])
+        self.assertEqual(self.suggest("ho"), [('movie', 'name', "Hoth Holiday Special")])
+
+
+class ObjectCacheTest(CatalogAPITestCase):
+
+    @override_settings(OBJECT_CACHE={**settings.OBJECT_CACHE, 'MAX_ENTRIES': 2, 'TTL_SECONDS': 60})
+    def test_lru_with_ttl_reports_hit_ratio__success(self):
+        for name in ("Hoth", "Tatooine", "Endor"):
+            Planet.objects.create(name=name)
+
+        with mock.patch('utils.objects.time.monotonic', return_value=1000.0):
+            for pk in (1, 2, 1, 3):
+                object_cache.get_or_404(Planet, pk)
+            self.assertIsNone(object_cache.get(Planet, 2))
+            self.assertEqual(object_cache.get(Planet, 1).name, "Hoth")
+        with mock.patch('utils.objects.time.monotonic', return_value=1060.0):
+            self.assertIsNone(object_cache.get(Planet, 3))
+
+        response = self.client.get(reverse('object_cache_stats'))
+        self.assertEqual(json.loads(response.content)['details'], {
+            'hits': 2, 'misses': 5, 'hit_ratio': 0.2857, 'evictions': 1, 'entries': 1,
+        })
+
+    def test_warm_command_preloads_favorites_first__success(self):
+        for index in range(3):
+            Movie.objects.create(name=f"Movie {index}", release_date="1977-05-25", is_favorite=index == 0)
+
+        stdout = StringIO()
+        call_command('warm_object_cache', '--rows', '2', stdout=stdout)
+        self.assertTrue(stdout.getvalue().startswith("Preloaded 2 movies in "))
+        self.assertEqual(
+            [object_cache.get(Movie, pk) is not None for pk in (1, 2, 3)], [True, False, True]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('movie_detail', args=(1,))).status_code, status.HTTP_200_OK)
+
+    def test_writes_of_other_processes_drop_cached_instances__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        self.client.get(reverse('movie_detail', args=(1,)))
+
+        # Another worker's favorite: its row and the shared response cache generation change, not this cache.
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE movies_movie SET is_favorite = 1 WHERE id = 1")
+        response_cache.invalidate(Movie)
+
+        self.assertIsNone(object_cache.get(Movie, 1))
+        response = self.client.get(reverse('movie_detail', args=(1,)))
+        self.assertTrue(json.loads(response.content)['details']['is_favorite'])
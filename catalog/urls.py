@@ -0,0 +1,13 @@
+from django.urls import re_path
+
+from catalog.views import (CatalogAutocompleteView, CatalogSearchView,
+                           CatalogStatsView, ObjectCacheStatsView,
+                           ResponseCacheStatsView)
+
+urlpatterns = [
+    re_path(r'^autocomplete/$', CatalogAutocompleteView.as_view(), name="catalog_autocomplete"),
+    re_path(r'^cache/objects/$', ObjectCacheStatsView.as_view(), name="object_cache_stats"),
+    re_path(r'^cache/$', ResponseCacheStatsView.as_view(), name="response_cache_stats"),
+    re_path(r'^search/$', CatalogSearchView.as_view(), name="catalog_search"),
+    re_path(r'^stats/$', CatalogStatsView.as_view(), name="catalog_stats"),
+]
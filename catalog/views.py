@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.http.request import HttpRequest
+from django.http.response import JsonResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from catalog.counters import catalog_counters
+from catalog.search import DETAIL_URL_NAMES, search_catalog
+from utils.autocomplete import autocomplete_index
+from utils.cache import response_cache
+from utils.helpers import filter_by_favorite
+from utils.objects import object_cache
+from utils.pagination import get_limit_query_param
+from utils.timing import timed
+
+
+class ResponseCacheStatsView(APIView):
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        data = {
+            "msg": "Response cache stats fetched successfully.",
+            "details": response_cache.stats(),
+        }
+        return JsonResponse(status=status.HTTP_200_OK, data=data)
+
+
+class ObjectCacheStatsView(APIView):
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        data = {
+            "msg": "Object cache stats fetched successfully.",
+            "details": object_cache.stats(),
+        }
+        return JsonResponse(status=status.HTTP_200_OK, data=data)
+
+
+class CatalogStatsView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        data = {
+            "msg": "Catalog stats fetched successfully.",
+            "details": catalog_counters.get_stats(),
+        }
+        return JsonResponse(status=status.HTTP_200_OK, data=data)
+
+
+class CatalogSearchView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        term = request.GET.get('name', '').strip()
+        if not term:
+            raise ValidationError({'name': ["This query parameter is required."]})
+        limit = get_limit_query_param(request)
+        rows = search_catalog(term, limit, lambda queryset: filter_by_favorite(queryset, request))
+
+        with timed('serialize'):
+            results = [
+                {
+                    "type": type,
+                    "name": name,
+                    "is_favorite": is_favorite,
+                    "url": request.build_absolute_uri(reverse(DETAIL_URL_NAMES[type], args=(pk,))),
+                }
+                for type, pk, name, is_favorite in rows
+            ]
+            data = {
+                "msg": "Catalog search results fetched successfully." if results else "No catalog search results.",
+                "results": results,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return response
+
+
+class CatalogAutocompleteView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        limit = get_limit_query_param(request, settings.AUTOCOMPLETE)
+        # Answered from the process's in-memory index, without a query once it is built.
+        suggestions = autocomplete_index.lookup(request.GET.get('name', ''), limit)
+
+        with timed('serialize'):
+            results = [
+                {
+                    "type": type,
+                    "field": field,
+                    "text": text,
+                    "url": request.build_absolute_uri(reverse(DETAIL_URL_NAMES[type], args=(pk,))),
+                }
+                for type, pk, field, text in suggestions
+            ]
+            data = {
+                "msg": "Autocomplete suggestions fetched successfully." if results else "No autocomplete suggestions.",
+                "suggestions": results,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return response
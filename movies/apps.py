@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        from catalog.counters import catalog_counters
+        from catalog.feed import tombstones
+        from movies.models import Movie
+        from utils.autocomplete import autocomplete_index
+        from utils.cache import response_cache
+        from utils.fragments import row_fragment_cache
+        from utils.objects import object_cache
+
+        response_cache.watch(Movie)
+        row_fragment_cache.watch(Movie)
+        object_cache.watch(Movie)
+        catalog_counters.watch(Movie, histogram_field='release_date')
+        tombstones.watch(Movie)
+        autocomplete_index.watch(Movie, fields=('name', 'custom_name'))
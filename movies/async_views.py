@@ -0,0 +1,104 @@
+from asgiref.sync import sync_to_async
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from movies.models import Movie
+from movies.serializers import (MovieFavoriteSerializer, MovieListSerializer,
+                                MovieSerializer)
+from utils.async_views import AsyncAPIView
+from utils.conditional import ConditionalGet
+from utils.helpers import (filter_by_favorite, get_ids_query_param,
+                           order_rows_by_ids)
+from utils.objects import object_cache
+from utils.pagination import KeysetPaginator
+from utils.search import search_queryset
+from utils.serializers import get_sparse_fields
+from utils.sqlite import write_lock
+from utils.streaming import JsonListResponse
+from utils.timing import timed
+
+
+class MovieAsyncView(AsyncAPIView):
+    read_from_replica = True
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        movies = Movie.objects.all()
+        filter_by_name = request.GET.get('name')
+        if filter_by_name:
+            movies = search_queryset(movies, 'name', filter_by_name)
+        movies = filter_by_favorite(movies, request)
+        ids = get_ids_query_param(request)
+        if ids is not None:
+            movies = movies.filter(id__in=ids)
+
+        conditional_get = await sync_to_async(ConditionalGet.for_queryset)(request, movies)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        list_serializer = MovieListSerializer(request, get_sparse_fields(request, MovieSerializer, extra=('url',)))
+        movies = list_serializer.get_rows(movies)
+
+        paginator = KeysetPaginator(request)
+        extra = {}
+        if ids is not None:
+            if paginator.is_enabled:
+                raise ValidationError({'ids': ["Cannot be combined with limit or cursor."]})
+            movies, extra["missing"] = await sync_to_async(order_rows_by_ids)(movies, ids)
+        elif paginator.is_enabled:
+            movies = await sync_to_async(paginator.paginate_queryset)(movies, list_serializer.row_position)
+            extra["next"] = paginator.next_cursor
+        else:
+            movies = await sync_to_async(list)(movies)
+
+        # Rows are plain tuples by now, so serializing them never touches the database.
+        movie_list = list(list_serializer.to_encoded_rows(movies))
+        with timed('encode'):
+            response = JsonListResponse(
+                movie_list,
+                key="movies",
+                msg="Movie list fetched successfully.",
+                empty_msg="Empty Movie list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            )
+        return conditional_get.apply(response)
+
+
+class MovieAsyncDetailView(AsyncAPIView):
+    read_from_replica = True
+
+    async def get(self, request: HttpRequest, id: str) -> HttpResponseBase:
+        fields = get_sparse_fields(request, MovieSerializer)
+        movie = object_cache.get(Movie, id)
+        if movie is None:
+            movie = await sync_to_async(object_cache.load)(Movie, id)
+        conditional_get = ConditionalGet.for_instance(request, movie)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        with timed('serialize'):
+            movie_serializer = MovieSerializer(movie, context={'fields': fields})
+            data = {
+                "msg": "Movie details fetched successfully.",
+                "details": movie_serializer.data,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return conditional_get.apply(response)
+
+
+class MovieAsyncFavoriteView(AsyncAPIView):
+
+    async def post(self, request: HttpRequest, id: str) -> JsonResponse:
+        movie_serializer = MovieFavoriteSerializer(data=request.POST, context={'movie_id': id})
+        movie_serializer.is_valid(raise_exception=True)
+        await sync_to_async(write_lock(movie_serializer.save))()
+        data = {
+            "msg": "Favorite movie added.",
+            "details": movie_serializer.data,
+        }
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from utils.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        CreateSearchIndex(model_name='movie', fields=['name', 'custom_name']),
+    ]
@@ -11,5 +11,19 @@ class Movie(CustomBaseModel):
 
     custom_name = models.CharField(max_length=50, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='movie_created_at_idx'),
+            models.Index(fields=['updated_at'], name='movie_updated_at_idx'),
+            models.Index(fields=['name'], name='movie_name_idx'),
+            models.Index(fields=['release_date'], name='movie_release_date_idx'),
+            models.Index(fields=['is_favorite', 'created_at'], name='movie_is_fav_created_idx'),
+            models.Index(fields=['is_favorite', 'name'], name='movie_is_fav_name_idx'),
+            # Favorites-only listings: the list views filter them with a bare `WHERE is_favorite`,
+            # which is what lets SQLite pick these much smaller partial indexes.
+            models.Index(fields=['created_at'], condition=models.Q(is_favorite=True), name='movie_fav_created_idx'),
+            models.Index(fields=['name'], condition=models.Q(is_favorite=True), name='movie_fav_name_idx'),
+        ]
+
     def __str__(self):
         return "{}".format(self.name)
@@ -1,13 +1,20 @@
+from django.http import Http404
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
 
 from movies.models import Movie
 from utils.helpers import get_local_datetime
+from utils.serializers import (BulkCreateListSerializer,
+                               FavoriteItemSerializer, SparseFieldsetMixin,
+                               ValuesListSerializer)
+from utils.signals import bulk_write
 
 
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Movie
+        list_serializer_class = BulkCreateListSerializer
         fields = (
             'name',
             'is_favorite',
@@ -16,10 +23,12 @@ class MovieSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['created_at'] = get_local_datetime(instance.created_at)
-        representation['updated_at'] = get_local_datetime(instance.updated_at)
+        if self.is_requested('created_at'):
+            representation['created_at'] = get_local_datetime(instance.created_at)
+        if self.is_requested('updated_at'):
+            representation['updated_at'] = get_local_datetime(instance.updated_at)
 
-        if self.context.get("from_list_view"):
+        if self.context.get("from_list_view") and self.is_requested('url'):
             representation['url'] = self.context["request"].build_absolute_uri(
                 reverse("movie_detail", args=(instance.pk,))
             )
@@ -27,17 +36,37 @@ class MovieSerializer(serializers.ModelSerializer):
         return representation
 
 
+class MovieListSerializer(ValuesListSerializer):
+    serializer_class = MovieSerializer
+    detail_url_name = "movie_detail"
+
+
 class MovieFavoriteSerializer(serializers.Serializer):
     custom_name = serializers.CharField(max_length=50, required=False)
 
     def create(self, validated_data):
-        movie = self.context.get('movie')
-        movie.is_favorite = True
+        # The URL capture is a string, and `bulk_write` receivers look rows up by their integer pk.
+        movie_id = int(self.context['movie_id'])
+        fields = {"is_favorite": True, "updated_at": timezone.now()}
 
         custom_name = validated_data.get("custom_name")
         if custom_name:
-            movie.custom_name = custom_name
+            fields["custom_name"] = custom_name
+
+        # A single conditional UPDATE: no read-modify-write round trip, and no
+        # lost update when two requests favorite the same movie concurrently.
+        if not Movie.objects.filter(id=movie_id).update(**fields):
+            raise Http404("No Movie matches the given query.")
+        bulk_write.send(sender=Movie, pks=[movie_id])
+
+        if not custom_name:
+            # The response shows the custom name, which this request did not set.
+            fields["custom_name"] = Movie.objects.filter(id=movie_id).values_list("custom_name", flat=True).first()
 
-        movie.save(update_fields=["is_favorite", "custom_name", "updated_at"])
+        return Movie(id=movie_id, **fields)
 
-        return movie
+
+class MovieBulkFavoriteSerializer(FavoriteItemSerializer):
+
+    class Meta(FavoriteItemSerializer.Meta):
+        model = Movie
@@ -1,13 +1,24 @@
 import json
+import time
+from datetime import timedelta
+from unittest import mock
 
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework import status
-from rest_framework.test import APITestCase
 
+from catalog.feed import encode_watermark
 from movies.models import Movie
+from movies.serializers import MovieListSerializer, MovieSerializer
+from utils.fragments import row_fragment_cache
+from utils.signals import bulk_write
+from utils.testing import CatalogAPITestCase
 
 
-class MovieListTest(APITestCase):
+class MovieListTest(CatalogAPITestCase):
 
     @property
     def url(self) -> str:
@@ -123,8 +134,442 @@ class MovieListTest(APITestCase):
         self.assertIsNotNone(first_movie['url'])
         self.assertTrue(first_movie['url'].endswith(reverse("movie_detail", args=(2,))))
 
+    def test_get_movie_list_with_limit_follows_next_cursor__success(self):
+        Movie.objects.create(name="A New Hope", release_date="2022-05-01")
+        Movie.objects.create(name="Return of the Jedi", release_date="2022-05-01")
+        Movie.objects.create(name="Revenge of the Sith", release_date="2022-05-01")
+
+        response = self.client.get(f'{self.url}?limit=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], 'Movie list fetched successfully.')
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["A New Hope", "Return of the Jedi"])
+        self.assertIsNotNone(response_body['next'])
+
+        response = self.client.get(self.url, data={"limit": 2, "cursor": response_body['next']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["Revenge of the Sith"])
+        self.assertIsNone(response_body['next'])
+
+    def test_get_movie_list_with_limit_ordered_by_name__success(self):
+        Movie.objects.create(name="Return of the Jedi", release_date="2022-05-01")
+        Movie.objects.create(name="A New Hope", release_date="2022-05-01")
+        Movie.objects.create(name="A New Hope", release_date="2022-05-01")
+
+        response = self.client.get(f'{self.url}?limit=2&ordering=name')
+        response_body = json.loads(response.content)
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["A New Hope", "A New Hope"])
+        self.assertTrue(response_body['movies'][1]['url'].endswith(reverse("movie_detail", args=(3,))))
+
+        response = self.client.get(self.url, data={"cursor": response_body['next']})
+        response_body = json.loads(response.content)
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["Return of the Jedi"])
+        self.assertIsNone(response_body['next'])
+
+    def test_get_movie_list_with_invalid_cursor__failure(self):
+        response = self.client.get(f'{self.url}?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(f'{self.url}?limit=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_movie_list_with_sparse_fields__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        response = self.client.get(f'{self.url}?fields=name,url&limit=5')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_body = json.loads(response.content)
+        detail_url = f"http://testserver{reverse('movie_detail', args=(1,))}"
+        self.assertEqual(response_body['movies'], [{"name": "A New Hope", "url": detail_url}])
+
+        response = self.client.get(f'{self.url}?fields=name,id')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', json.loads(response.content))
+
+    def test_get_movie_list_filtered_by_is_favorite__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25", is_favorite=True)
+        Movie.objects.create(name="The Empire Strikes Back", release_date="1980-05-17")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25", is_favorite=True)
+
+        response_body = json.loads(self.client.get(f'{self.url}?is_favorite=true').content)
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["A New Hope", "Return of the Jedi"])
+
+        response_body = json.loads(self.client.get(f'{self.url}?is_favorite=false').content)
+        self.assertEqual([movie['name'] for movie in response_body['movies']], ["The Empire Strikes Back"])
+
+        response = self.client.get(f'{self.url}?is_favorite=maybe')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), {"is_favorite": ["Must be a valid boolean."]})
+
+    def test_get_movie_list_by_ids__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="The Empire Strikes Back", release_date="1980-05-17")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
 
-class MovieDetailTest(APITestCase):
+        # The conditional GET aggregate and a single `id IN (...)` lookup.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'ids': '3,42,1,3', 'fields': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {
+            "msg": "Movie list fetched successfully.",
+            "movies": [{"name": "Return of the Jedi"}, {"name": "A New Hope"}],
+            "missing": [42],
+        })
+
+        response = self.client.get(self.url, {'ids': '2,3', 'stream': 'true'})
+        self.assertEqual([movie['name'] for movie in json.loads(b"".join(response.streaming_content))['movies']],
+                         ["The Empire Strikes Back", "Return of the Jedi"])
+
+    @override_settings(BATCH_LOOKUP={'MAX_IDS': 2})
+    def test_get_movie_list_by_ids__failure(self):
+        for params, errors in [
+            ({'ids': '1,two'}, {"ids": ["Must be a comma-separated list of integers."]}),
+            ({'ids': ''}, {"ids": ["Must be a comma-separated list of integers."]}),
+            ({'ids': '1,2,3'}, {"ids": ["Ensure there are no more than 2 ids."]}),
+            ({'ids': '1,2', 'limit': 1}, {"ids": ["Cannot be combined with limit or cursor."]}),
+        ]:
+            for url in (self.url, reverse('movies_list_async')):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(json.loads(response.content), errors)
+
+    @override_settings(STREAMING_LIST={'CHUNK_SIZE': 2, 'ROWS_PER_WRITE': 2})
+    def test_get_movie_list_streamed_matches_regular_response__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        Movie.objects.create(name="Revenge of the Sith", release_date="2005-05-19")
+
+        for query in ['', 'name=the', 'limit=2', 'name=invalid-name']:
+            regular_response = self.client.get(f'{self.url}?{query}')
+            streamed_response = self.client.get(f'{self.url}?{query}&stream=true')
+            self.assertTrue(streamed_response.streaming)
+            self.assertEqual(streamed_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(b"".join(streamed_response.streaming_content), regular_response.content)
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    })
+    def test_get_movie_list_with_matching_etag__not_modified(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Last-Modified', response.headers)
+        etag = response.headers['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(f'{self.url}?name=hope', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        etag = response.headers['ETag']
+
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        Movie.objects.update(updated_at=Movie.objects.get(id=1).updated_at)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # The latest `updated_at` stays put when a row is deleted, so lists ignore If-Modified-Since.
+        Movie.objects.filter(name="Return of the Jedi").delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(json.loads(response.content)['movies']), 1)
+
+
+class MovieListSerializerTest(CatalogAPITestCase):
+
+    def test_list_serializer_output_matches_movie_serializer__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25", is_favorite=True)
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25", custom_name="Jedi")
+        Movie.objects.filter(name="A New Hope").update(updated_at=timezone.now())
+        request = RequestFactory().get(reverse("movies_list"))
+
+        for tz in ["Asia/Kolkata", "America/New_York"]:
+            with timezone.override(tz):
+                expected = MovieSerializer(
+                    Movie.objects.all(),
+                    many=True,
+                    context={'request': request, "from_list_view": True}
+                ).data
+                list_serializer = MovieListSerializer(request)
+                actual = list(list_serializer.to_representations(list_serializer.get_rows(Movie.objects.all())))
+
+            self.assertEqual(
+                DjangoJSONEncoder().encode(actual).encode(), DjangoJSONEncoder().encode(expected).encode()
+            )
+
+    def test_encoded_rows_match_representations_and_reuse_unchanged_rows__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25", is_favorite=True)
+        Movie.objects.create(name='Return of the "Jedi"', release_date="1983-05-25")
+        request = RequestFactory().get(reverse("movies_list"))
+
+        for fields in [None, ('url',), ('name', 'updated_at'), ('release_date', 'url')]:
+            list_serializer = MovieListSerializer(request, fields)
+            expected = [
+                DjangoJSONEncoder().encode(representation)
+                for representation in list_serializer.to_representations(list_serializer.get_rows(Movie.objects.all()))
+            ]
+            for _ in range(2):
+                self.assertEqual(list(list_serializer.to_encoded_rows(list_serializer.get_rows(Movie.objects.all()))),
+                                 expected)
+        self.assertEqual(row_fragment_cache.stats()['hits'], row_fragment_cache.stats()['misses'])
+
+        entries = row_fragment_cache.stats()['entries']
+        self.client.post(reverse('movie_favorite', args=(2,)))
+        # The favorite drops the movie's fragments (one per field set) rather than leaving them to age out.
+        self.assertEqual(row_fragment_cache.stats()['entries'], entries - 4)
+        misses = row_fragment_cache.stats()['misses']
+        response = self.client.get(reverse('movies_list'))
+        self.assertEqual(row_fragment_cache.stats()['misses'], misses + 1)
+        self.assertEqual([movie['is_favorite'] for movie in json.loads(response.content)['movies']], [True, True])
+
+
+class MovieSearchTest(CatalogAPITestCase):
+
+    @property
+    def url(self) -> str:
+        return reverse('movies_list')
+
+    def search(self, name: str) -> list:
+        response = self.client.get(self.url, data={"name": name})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie['name'] for movie in json.loads(response.content)['movies']]
+
+    def test_search_matches_icontains_results__success(self):
+        Movie.objects.bulk_create([
+            Movie(name="A New Hope", release_date="1977-05-25"),
+            Movie(name="The Empire Strikes Back", release_date="1980-05-17"),
+            Movie(name="Return of the Jedi", release_date="1983-05-25"),
+            Movie(name="The Phantom Menace", release_date="1999-05-19"),
+            Movie(name="100% Jedi_", release_date="1999-05-19"),
+        ])
+
+        for term in ["the", "THE", "jedi", "e", "ew h", "0% j", "i_", "sith", 'a "new"']:
+            expected = set(Movie.objects.filter(name__icontains=term).values_list('name', flat=True))
+            self.assertEqual(set(self.search(term)), expected, term)
+
+    def test_search_index_follows_updates_and_deletes__success(self):
+        movie = Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        self.assertEqual(self.search("hope"), ["A New Hope"])
+
+        movie.name = "Rogue One"
+        movie.save()
+        self.assertEqual(self.search("hope"), [])
+        self.assertEqual(self.search("rogue"), ["Rogue One"])
+
+        Movie.objects.filter(id=movie.id).update(name="Solo")
+        bulk_write.send(sender=Movie, pks=[movie.id])
+        self.assertEqual(self.search("rogue"), [])
+        self.assertEqual(self.search("sol"), ["Solo"])
+
+        movie.delete()
+        self.assertEqual(self.search("sol"), [])
+
+    def test_search_ranks_closer_matches_first__success(self):
+        Movie.objects.create(name="Attack of the Clones", release_date="2002-05-16")
+        Movie.objects.create(name="The Clone Wars and the Return of the Clone", release_date="2008-08-15")
+
+        self.assertEqual(self.search("clone"), ["The Clone Wars and the Return of the Clone", "Attack of the Clones"])
+
+
+class MovieBulkTest(CatalogAPITestCase):
+
+    @property
+    def url(self) -> str:
+        return reverse('movies_bulk')
+
+    def test_bulk_create_movies_from_json_array__success(self):
+        self.assertEqual(len(json.loads(self.client.get(reverse('movies_list')).content)['movies']), 0)
+
+        payload = [
+            {"name": "A New Hope", "release_date": "1977-05-25"},
+            {"name": "The Empire Strikes Back", "release_date": "1980-05-17", "is_favorite": True},
+        ]
+        with self.settings(BULK_WRITE={'BATCH_SIZE': 1}):
+            response = self.client.post(self.url, data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Movies created successfully.")
+        self.assertEqual(response_body['details']['created'], 2)
+
+        self.assertEqual(
+            list(Movie.objects.order_by('id').values_list('name', 'is_favorite')),
+            [("A New Hope", False), ("The Empire Strikes Back", True)],
+        )
+        self.assertEqual(len(json.loads(self.client.get(reverse('movies_list')).content)['movies']), 2)
+        self.assertEqual(self.search_count("empire"), 1)
+
+    def test_bulk_create_movies_from_ndjson__success(self):
+        payload = (
+            '{"name": "A New Hope", "release_date": "1977-05-25"}\n'
+            '\n'
+            '{"name": "Rogue One", "release_date": "2016-12-16"}\n'
+        )
+        response = self.client.post(self.url, data=payload, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Movie.objects.count(), 2)
+
+    def test_bulk_create_movies_when_some_items_are_invalid__failure(self):
+        payload = [
+            {"name": "A New Hope", "release_date": "1977-05-25"},
+            {"name": "", "release_date": "1980-05-17"},
+            {"name": "Return of the Jedi"},
+        ]
+        response = self.client.post(self.url, data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Movies not created.")
+        self.assertEqual(response_body['errors'], [
+            {"index": 1, "name": ["This field may not be blank."]},
+            {"index": 2, "release_date": ["This field is required."]},
+        ])
+        self.assertEqual(Movie.objects.count(), 0)
+
+    def test_bulk_create_movies_when_payload_is_not_a_list__failure(self):
+        response = self.client.post(self.url, data={"name": "A New Hope"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, data='{"name": ', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def search_count(self, name: str) -> int:
+        return len(json.loads(self.client.get(reverse('movies_list'), data={"name": name}).content)['movies'])
+
+
+@override_settings(CHANGE_FEED={'SETTLE_SECONDS': 0, 'RETENTION_DAYS': 30})
+class MovieChangesTest(CatalogAPITestCase):
+
+    def changes(self, **params) -> dict:
+        response = self.client.get(reverse('movies_changes'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    @staticmethod
+    def ids(data: dict) -> list:
+        return [int(movie['url'].rstrip('/').rsplit('/', 1)[1]) for movie in data['movies']]
+
+    def test_movie_changes_since_watermark__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+
+        data = self.changes()
+        self.assertEqual(self.ids(data), [1, 2])
+        self.assertEqual((data['deleted'], data['has_more']), ([], False))
+        self.assertEqual(data['movies'][0], json.loads(self.client.get(reverse('movies_list')).content)['movies'][0])
+
+        data = self.changes(since=data['watermark'])
+        self.assertEqual((data['msg'], data['movies'], data['deleted']), ("No changed Movies.", [], []))
+
+        self.client.post(reverse('movie_favorite', args=(2,)))
+        Movie.objects.filter(id=1).delete()
+        data = self.changes(since=data['watermark'])
+        self.assertEqual((self.ids(data), data['movies'][0]['is_favorite']), ([2], True))
+        self.assertEqual(data['deleted'], [1])
+        self.assertEqual(self.changes(since=data['watermark'])['deleted'], [])
+
+    def test_movie_changes_pagination__success(self):
+        for name in ("A New Hope", "The Empire Strikes Back", "Return of the Jedi"):
+            Movie.objects.create(name=name, release_date="1977-05-25")
+        Movie.objects.filter(id=2).delete()
+        Movie.objects.filter(id=1).update(updated_at=timezone.now())
+
+        pages, params = [], {'limit': 1}
+        while True:
+            data = self.changes(**params)
+            pages.append((self.ids(data), data['deleted']))
+            params['since'] = data['watermark']
+            if not data['has_more']:
+                break
+        self.assertEqual(pages, [([3], []), ([], [2]), ([1], [])])
+
+    def test_movie_changes_wait_for_settled_writes__success(self):
+        watermark = self.changes()['watermark']
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        with override_settings(CHANGE_FEED={'SETTLE_SECONDS': 60, 'RETENTION_DAYS': 30}):
+            data = self.changes(since=watermark)
+        self.assertEqual(data['movies'], [])
+        self.assertEqual(self.ids(self.changes(since=data['watermark'])), [1])
+
+    def test_movie_changes_serve_rows_at_the_settle_boundary_once__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        now = timezone.now()
+        Movie.objects.update(updated_at=now)
+
+        pages, since = [], None
+        for poll_at in (now, now + timedelta(seconds=1), now + timedelta(seconds=2)):
+            with mock.patch('catalog.feed.timezone.now', return_value=poll_at):
+                data = self.changes(**({'since': since} if since else {}))
+            pages.append(self.ids(data))
+            since = data['watermark']
+        self.assertEqual(pages, [[], [1], []])
+
+    def test_movie_changes_bad_watermark__failure(self):
+        response = self.client.get(reverse('movies_changes'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', json.loads(response.content))
+
+        expired = encode_watermark(timezone.now() - timedelta(days=31), 0)
+        response = self.client.get(reverse('movies_changes'), {'since': expired})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+
+class MovieExportTest(CatalogAPITestCase):
+
+    def export(self, export_format: str, **params) -> bytes:
+        response = self.client.get(reverse('movies_export', args=(export_format,)), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_export_movies_as_ndjson_and_csv__success(self):
+        Movie.objects.create(name='Return of the "Jedi"', release_date="1983-05-25", is_favorite=True)
+        Movie.objects.create(name="A New Hope, Special Edition", release_date="1977-05-25")
+        Movie.objects.filter(id=1).update(updated_at=timezone.now())
+
+        rows = [json.loads(line) for line in self.export('ndjson').decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [2, 1])
+        self.assertEqual(
+            {key: rows[1][key] for key in ('name', 'is_favorite', 'release_date')},
+            {'name': 'Return of the "Jedi"', 'is_favorite': True, 'release_date': '1983-05-25'},
+        )
+        self.assertEqual(set(rows[0]), {'id', 'name', 'is_favorite', 'release_date', 'created_at', 'updated_at'})
+
+        lines = self.export('csv').decode().splitlines()
+        self.assertEqual(lines[0], "id,name,is_favorite,release_date,created_at,updated_at")
+        self.assertTrue(lines[1].startswith('2,"A New Hope, Special Edition",false,1977-05-25,'))
+        self.assertTrue(lines[2].startswith('1,"Return of the ""Jedi""",true,1983-05-25,'))
+        self.assertEqual(self.export('csv', name="nothing").decode().splitlines(), lines[:1])
+
+    def test_export_movies_updated_since__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        last_row = json.loads(self.export('ndjson').decode().splitlines()[-1])
+
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        rows = [json.loads(line) for line in self.export('ndjson', updated_since=last_row['updated_at']).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [2, 1])
+        self.assertEqual(len(self.export('ndjson', updated_since=rows[1]['updated_at'], name="hope").splitlines()), 1)
+
+        response = self.client.get(reverse('movies_export', args=('csv',)), {'updated_since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('updated_since', json.loads(response.content))
+
+
+class MovieDetailTest(CatalogAPITestCase):
 
     def url(self, id: int) -> str:
         return reverse('movie_detail', args=(id,))
@@ -149,8 +594,47 @@ class MovieDetailTest(APITestCase):
         self.assertIsNotNone(response_body['details']['created_at'])
         self.assertIsNotNone(response_body['details']['updated_at'])
 
+    def test_get_movie_detail_from_object_cache_until_written__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        for id in (1, 2):
+            self.client.get(self.url(id=id))
+        with self.assertNumQueries(0):
+            self.client.get(self.url(id=1), {'fields': 'name'})
+
+        self.client.post(reverse('movie_favorite', args=(1,)))
+        self.client.post(reverse('movies_bulk_favorite'), data=[{"id": 2}], format='json')
+        for id in (1, 2):
+            self.assertTrue(json.loads(self.client.get(self.url(id=id)).content)['details']['is_favorite'])
+        Movie.objects.filter(id=1).delete()
+        self.assertEqual(self.client.get(self.url(id=1)).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_movie_detail_with_matching_etag__not_modified(self):
+        Movie.objects.create(name="Movie 1", release_date="2022-05-01")
+
+        response = self.client.get(self.url(id=1))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+
+        response = self.client.get(self.url(id=1), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers['ETag'], etag)
+
+        response = self.client.get(self.url(id=1), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
 
-class MovieFavoriteTest(APITestCase):
+    def test_get_movie_detail_with_sparse_fields__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+
+        self.client.get(self.url(id=1))
+        # The cached instance of the full representation serves every sparse fieldset.
+        with self.assertNumQueries(0):
+            response = self.client.get(f"{self.url(id=1)}?fields=name,created_at")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(json.loads(response.content)['details']), ["name", "created_at"])
+
+
+class MovieFavoriteTest(CatalogAPITestCase):
 
     def url(self, id: int) -> str:
         return reverse('movie_favorite', args=(id, ))
@@ -183,3 +667,86 @@ class MovieFavoriteTest(APITestCase):
         movie.refresh_from_db()
         self.assertTrue(movie.is_favorite)
         self.assertEqual(movie.custom_name, custom_name)
+
+    def test_add_favorite_movie_is_a_single_update__success(self):
+        Movie.objects.create(name="A New Hope", release_date="2022-05-01", custom_name="Star Wars")
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url(id=1), data={"custom_name": "Episode IV"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content)['details'], {"custom_name": "Episode IV"})
+
+        # Without a custom name in the payload the current one is read back for the response.
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url(id=1))
+        self.assertEqual(json.loads(response.content)['details'], {"custom_name": "Episode IV"})
+
+
+class MovieBulkFavoriteTest(CatalogAPITestCase):
+
+    @property
+    def url(self) -> str:
+        return reverse('movies_bulk_favorite')
+
+    def test_bulk_favorite_movies__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25", custom_name="Star Wars")
+        Movie.objects.create(name="The Empire Strikes Back", release_date="1980-05-17")
+        Movie.objects.create(name="Return of the Jedi", release_date="1983-05-25")
+        Movie.objects.create(name="The Phantom Menace", release_date="1999-05-19")
+        before = Movie.objects.get(id=1).updated_at
+
+        payload = [{"id": 1}, {"id": 2, "custom_name": "Empire"}, {"id": 3, "custom_name": "Jedi"}, {"id": 42}]
+        # SAVEPOINT, SELECT, UPDATE is_favorite, UPDATE custom_name, RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Favorite movies added.")
+        self.assertEqual(response_body['details'], {"favorited": [1, 2, 3], "missing": [42]})
+
+        self.assertEqual(
+            list(Movie.objects.order_by('id').values_list('is_favorite', 'custom_name')),
+            [(True, "Star Wars"), (True, "Empire"), (True, "Jedi"), (False, None)],
+        )
+        self.assertGreater(Movie.objects.get(id=1).updated_at, before)
+
+        response_body = json.loads(self.client.get(reverse('movies_list')).content)
+        self.assertEqual([movie['is_favorite'] for movie in response_body['movies']], [True, True, True, False])
+
+    def test_bulk_favorite_movies_when_id_is_invalid__failure(self):
+        response = self.client.post(self.url, data=[{"id": "one"}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MovieAsyncViewTest(CatalogAPITestCase):
+
+    def test_async_views_match_sync_views__success(self):
+        Movie.objects.create(name="A New Hope", release_date="1977-05-25")
+        Movie.objects.create(name="The Empire Strikes Back", release_date="1980-05-17")
+
+        for sync_url, async_url in [
+            (reverse('movies_list'), reverse('movies_list_async')),
+            (f"{reverse('movies_list')}?limit=1", f"{reverse('movies_list_async')}?limit=1"),
+            (f"{reverse('movies_list')}?ids=2,5,1", f"{reverse('movies_list_async')}?ids=2,5,1"),
+            (reverse('movie_detail', args=(1,)), reverse('movie_detail_async', args=(1,))),
+        ]:
+            response = self.client.get(async_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content), json.loads(self.client.get(sync_url).content))
+
+    def test_async_detail_when_id_is_invalid__failure(self):
+        response = self.client.get(reverse('movie_detail_async', args=(1,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content), {"detail": "Not found."})
+
+    def test_async_favorite__success(self):
+        Movie.objects.create(name="The Empire Strikes Back", release_date="1980-05-17")
+
+        response = self.client.post(reverse('movie_favorite_async', args=(1,)), data={"custom_name": "Echo Base"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content)['details'], {"custom_name": "Echo Base"})
+        self.assertTrue(Movie.objects.get(id=1).is_favorite)
+
+        response = self.client.post(reverse('movie_favorite_async', args=(2,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
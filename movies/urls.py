@@ -1,8 +1,19 @@
 from django.urls import re_path
 
-from movies.views import MovieDetailView, MovieFavoriteView, MovieView
+from movies.async_views import (MovieAsyncDetailView, MovieAsyncFavoriteView,
+                                MovieAsyncView)
+from movies.views import (MovieBulkFavoriteView, MovieBulkView,
+                          MovieChangesView, MovieDetailView, MovieExportView,
+                          MovieFavoriteView, MovieView)
 
 urlpatterns = [
+    re_path(r'^async/(?P<id>[0-9]+)/favorite/$', MovieAsyncFavoriteView.as_view(), name="movie_favorite_async"),
+    re_path(r'^async/(?P<id>[0-9]+)/$', MovieAsyncDetailView.as_view(), name="movie_detail_async"),
+    re_path(r'^async/$', MovieAsyncView.as_view(), name="movies_list_async"),
+    re_path(r'^changes/$', MovieChangesView.as_view(), name="movies_changes"),
+    re_path(r'^export\.(?P<export_format>ndjson|csv)$', MovieExportView.as_view(), name="movies_export"),
+    re_path(r'^bulk/$', MovieBulkView.as_view(), name="movies_bulk"),
+    re_path(r'^favorite/$', MovieBulkFavoriteView.as_view(), name="movies_bulk_favorite"),
     re_path(r'(?P<id>[0-9]+)/favorite/', MovieFavoriteView.as_view(), name="movie_favorite"),
     re_path(r'(?P<id>[0-9]+)/', MovieDetailView.as_view(), name="movie_detail"),
     re_path(r'', MovieView.as_view(), name="movies_list"),
@@ -1,38 +1,95 @@
+from django.db.models import QuerySet
 from django.http.request import HttpRequest
-from django.http.response import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http.response import HttpResponseBase, JsonResponse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.views import APIView
 
+from catalog.feed import read_changes
 from movies.models import Movie
-from movies.serializers import MovieFavoriteSerializer, MovieSerializer
+from movies.serializers import (MovieBulkFavoriteSerializer,
+                                MovieFavoriteSerializer, MovieListSerializer,
+                                MovieSerializer)
+from utils.cache import cache_response
+from utils.conditional import ConditionalGet
+from utils.export import StreamingExportResponse, get_export_columns
+from utils.helpers import (filter_by_favorite, filter_by_updated_since,
+                           get_bool_query_param, get_ids_query_param,
+                           order_rows_by_ids)
+from utils.objects import object_cache
+from utils.pagination import KeysetPaginator
+from utils.parsers import NDJSONParser
+from utils.search import search_queryset
+from utils.serializers import get_sparse_fields
+from utils.sqlite import write_lock
+from utils.streaming import JsonListResponse, StreamingJsonListResponse
+from utils.timing import timed
 
 
 class MovieView(APIView):
+    read_from_replica = True
 
-    def get(self, request: HttpRequest) -> JsonResponse:
-        filter_by_fields = {}
+    @cache_response(Movie)
+    def get(self, request: HttpRequest) -> HttpResponseBase:
+        movies = Movie.objects.all()
         filter_by_name = request.GET.get('name')
         if filter_by_name:
-            filter_by_fields["name__icontains"] = filter_by_name
+            movies = search_queryset(movies, 'name', filter_by_name)
+        movies = filter_by_favorite(movies, request)
+        ids = get_ids_query_param(request)
+        if ids is not None:
+            movies = movies.filter(id__in=ids)
 
-        movies = Movie.objects.filter(**filter_by_fields)
-        movie_serializer = MovieSerializer(
-            movies,
-            many=True,
-            context={'request': request, "from_list_view": True}
-        )
+        conditional_get = ConditionalGet.for_queryset(request, movies)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
 
-        data = {
-            "msg": "Movie list fetched successfully." if movie_serializer.data else "Empty Movie list.",
-            "movies": movie_serializer.data,
-        }
-        return JsonResponse(status=status.HTTP_200_OK, data=data)
+        list_serializer = MovieListSerializer(request, get_sparse_fields(request, MovieSerializer, extra=('url',)))
+        movies = list_serializer.get_rows(movies)
+
+        paginator = KeysetPaginator(request)
+        extra = {}
+        if ids is not None:
+            if paginator.is_enabled:
+                raise ValidationError({'ids': ["Cannot be combined with limit or cursor."]})
+            # Rows come back in index order, so they are put in the requested one.
+            movies, extra["missing"] = order_rows_by_ids(movies, ids)
+        elif paginator.is_enabled:
+            movies = paginator.paginate_queryset(movies, list_serializer.row_position)
+            extra["next"] = paginator.next_cursor
+
+        if get_bool_query_param(request, 'stream'):
+            if isinstance(movies, QuerySet):
+                # The rows are read after the view has returned, outside of the request's database routing.
+                movies = movies.using(movies.db)
+            return conditional_get.apply(StreamingJsonListResponse(
+                list_serializer.to_encoded_rows(movies),
+                key="movies",
+                msg="Movie list fetched successfully.",
+                empty_msg="Empty Movie list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            ))
+
+        movie_list = list(list_serializer.to_encoded_rows(movies))
+        with timed('encode'):
+            response = JsonListResponse(
+                movie_list,
+                key="movies",
+                msg="Movie list fetched successfully.",
+                empty_msg="Empty Movie list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            )
+        return conditional_get.apply(response)
 
     def post(self, request: HttpRequest) -> JsonResponse:
         movie_serializer = MovieSerializer(data=request.POST)
         movie_serializer.is_valid(raise_exception=True)
-        movie_serializer.save()
+        with write_lock:
+            movie_serializer.save()
         data = {
             "msg": "Movie created successfully.",
             "details": movie_serializer.data,
@@ -40,27 +97,115 @@ class MovieView(APIView):
         return JsonResponse(status=status.HTTP_201_CREATED, data=data)
 
 
-class MovieDetailView(APIView):
+class MovieChangesView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest) -> HttpResponseBase:
+        fields = get_sparse_fields(request, MovieSerializer, extra=('url',))
+        if fields is not None:
+            # Clients match changed rows to their copies by `url`, so it is always rendered.
+            fields = tuple(dict.fromkeys((*fields, 'url')))
+        list_serializer = MovieListSerializer(request, fields)
+        page = read_changes(request, list_serializer.get_rows(Movie.objects.all()), list_serializer.row_position)
+
+        movie_list = list(list_serializer.to_encoded_rows(page.rows))
+        with timed('encode'):
+            response = JsonListResponse(
+                movie_list,
+                key="movies",
+                msg="Movie changes fetched successfully.",
+                empty_msg="No changed Movies.",
+                extra={"deleted": page.deleted, "watermark": page.watermark, "has_more": page.has_more},
+                status=status.HTTP_200_OK,
+            )
+        return response
+
+
+class MovieExportView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest, export_format: str) -> HttpResponseBase:
+        movies = Movie.objects.all()
+        filter_by_name = request.GET.get('name')
+        if filter_by_name:
+            movies = search_queryset(movies, 'name', filter_by_name)
+        movies = filter_by_favorite(movies, request)
+        # Oldest change first, so the last row's `updated_at` is the next `updated_since`.
+        movies = filter_by_updated_since(movies, request).order_by('updated_at', 'id')
+
+        return StreamingExportResponse(
+            movies, get_export_columns(MovieSerializer), export_format, filename="movies", status=status.HTTP_200_OK
+        )
+
 
-    def get(self, request: HttpRequest, id: str) -> JsonResponse:
-        planet = get_object_or_404(Movie, id=id)
-        planet_serializer = MovieSerializer(planet)
+class MovieBulkView(APIView):
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        movie_serializer = MovieSerializer(data=request.data, many=True)
+        if not movie_serializer.is_valid():
+            data = {
+                "msg": "Movies not created.",
+                "errors": movie_serializer.get_item_errors(),
+            }
+            return JsonResponse(status=status.HTTP_400_BAD_REQUEST, data=data)
+
+        with write_lock:
+            movies = movie_serializer.save()
         data = {
-            "msg": "Movie details fetched successfully.",
-            "details": planet_serializer.data,
+            "msg": "Movies created successfully.",
+            "details": {"created": len(movies)},
         }
-        return JsonResponse(status=status.HTTP_200_OK, data=data)
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
+
+
+class MovieDetailView(APIView):
+    read_from_replica = True
+
+    @cache_response(Movie)
+    def get(self, request: HttpRequest, id: str) -> HttpResponseBase:
+        fields = get_sparse_fields(request, MovieSerializer)
+        # Full rows, so that one cached instance serves every sparse fieldset.
+        planet = object_cache.get_or_404(Movie, id)
+        conditional_get = ConditionalGet.for_instance(request, planet)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        with timed('serialize'):
+            planet_serializer = MovieSerializer(planet, context={'fields': fields})
+            data = {
+                "msg": "Movie details fetched successfully.",
+                "details": planet_serializer.data,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return conditional_get.apply(response)
 
 
 class MovieFavoriteView(APIView):
 
     def post(self, request: HttpRequest, id: str) -> JsonResponse:
-        movie = get_object_or_404(Movie, id=id)
-        movie_serializer = MovieFavoriteSerializer(data=request.POST, context={'movie': movie})
+        movie_serializer = MovieFavoriteSerializer(data=request.POST, context={'movie_id': id})
         movie_serializer.is_valid(raise_exception=True)
-        movie_serializer.save()
+        with write_lock:
+            movie_serializer.save()
         data = {
             "msg": "Favorite movie added.",
             "details": movie_serializer.data,
         }
         return JsonResponse(status=status.HTTP_201_CREATED, data=data)
+
+
+class MovieBulkFavoriteView(APIView):
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        movie_serializer = MovieBulkFavoriteSerializer(data=request.data, many=True)
+        movie_serializer.is_valid(raise_exception=True)
+        with write_lock:
+            favorites = movie_serializer.save()
+        data = {
+            "msg": "Favorite movies added.",
+            "details": favorites,
+        }
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class PlanetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'planets'
+
+    def ready(self):
+        from catalog.counters import catalog_counters
+        from catalog.feed import tombstones
+        from planets.models import Planet
+        from utils.autocomplete import autocomplete_index
+        from utils.cache import response_cache
+        from utils.fragments import row_fragment_cache
+        from utils.objects import object_cache
+
+        response_cache.watch(Planet)
+        row_fragment_cache.watch(Planet)
+        object_cache.watch(Planet)
+        catalog_counters.watch(Planet)
+        tombstones.watch(Planet)
+        autocomplete_index.watch(Planet, fields=('name',))
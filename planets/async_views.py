@@ -0,0 +1,104 @@
+from asgiref.sync import sync_to_async
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from planets.models import Planet
+from planets.serializers import (PlanetFavoriteSerializer,
+                                 PlanetListSerializer, PlanetSerializer)
+from utils.async_views import AsyncAPIView
+from utils.conditional import ConditionalGet
+from utils.helpers import (filter_by_favorite, get_ids_query_param,
+                           order_rows_by_ids)
+from utils.objects import object_cache
+from utils.pagination import KeysetPaginator
+from utils.search import search_queryset
+from utils.serializers import get_sparse_fields
+from utils.sqlite import write_lock
+from utils.streaming import JsonListResponse
+from utils.timing import timed
+
+
+class PlanetAsyncView(AsyncAPIView):
+    read_from_replica = True
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        planets = Planet.objects.all()
+        filter_by_name = request.GET.get('name')
+        if filter_by_name:
+            planets = search_queryset(planets, 'name', filter_by_name)
+        planets = filter_by_favorite(planets, request)
+        ids = get_ids_query_param(request)
+        if ids is not None:
+            planets = planets.filter(id__in=ids)
+
+        conditional_get = await sync_to_async(ConditionalGet.for_queryset)(request, planets)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        list_serializer = PlanetListSerializer(request, get_sparse_fields(request, PlanetSerializer, extra=('url',)))
+        planets = list_serializer.get_rows(planets)
+
+        paginator = KeysetPaginator(request)
+        extra = {}
+        if ids is not None:
+            if paginator.is_enabled:
+                raise ValidationError({'ids': ["Cannot be combined with limit or cursor."]})
+            planets, extra["missing"] = await sync_to_async(order_rows_by_ids)(planets, ids)
+        elif paginator.is_enabled:
+            planets = await sync_to_async(paginator.paginate_queryset)(planets, list_serializer.row_position)
+            extra["next"] = paginator.next_cursor
+        else:
+            planets = await sync_to_async(list)(planets)
+
+        # Rows are plain tuples by now, so serializing them never touches the database.
+        planet_list = list(list_serializer.to_encoded_rows(planets))
+        with timed('encode'):
+            response = JsonListResponse(
+                planet_list,
+                key="planets",
+                msg="Planet list fetched successfully.",
+                empty_msg="Empty planet list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            )
+        return conditional_get.apply(response)
+
+
+class PlanetAsyncDetailView(AsyncAPIView):
+    read_from_replica = True
+
+    async def get(self, request: HttpRequest, id: str) -> HttpResponseBase:
+        fields = get_sparse_fields(request, PlanetSerializer)
+        planet = object_cache.get(Planet, id)
+        if planet is None:
+            planet = await sync_to_async(object_cache.load)(Planet, id)
+        conditional_get = ConditionalGet.for_instance(request, planet)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        with timed('serialize'):
+            planet_serializer = PlanetSerializer(planet, context={'fields': fields})
+            data = {
+                "msg": "Planet details fetched successfully.",
+                "details": planet_serializer.data,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return conditional_get.apply(response)
+
+
+class PlanetAsyncFavoriteView(AsyncAPIView):
+
+    async def post(self, request: HttpRequest, id: str) -> JsonResponse:
+        planet_serializer = PlanetFavoriteSerializer(data=request.POST, context={'planet_id': id})
+        planet_serializer.is_valid(raise_exception=True)
+        await sync_to_async(write_lock(planet_serializer.save))()
+        data = {
+            "msg": "Favorite planet added.",
+            "details": planet_serializer.data,
+        }
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from utils.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planets', '0001_initial'),
+    ]
+
+    operations = [
+        CreateSearchIndex(model_name='planet', fields=['name']),
+    ]
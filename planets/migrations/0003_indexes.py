@@ -0,0 +1,41 @@
+# Generated by Django 4.0.4 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planets', '0002_planet_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(fields=['created_at'], name='planet_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(fields=['updated_at'], name='planet_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(fields=['name'], name='planet_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(fields=['is_favorite', 'created_at'], name='planet_is_fav_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(fields=['is_favorite', 'name'], name='planet_is_fav_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['created_at'], name='planet_fav_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planet',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['name'], name='planet_fav_name_idx'),
+        ),
+    ]
@@ -1,13 +1,20 @@
+from django.http import Http404
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
 
 from planets.models import Planet
 from utils.helpers import get_local_datetime
+from utils.serializers import (BulkCreateListSerializer,
+                               FavoriteItemSerializer, SparseFieldsetMixin,
+                               ValuesListSerializer)
+from utils.signals import bulk_write
 
 
-class PlanetSerializer(serializers.ModelSerializer):
+class PlanetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Planet
+        list_serializer_class = BulkCreateListSerializer
         fields = (
             'name',
             'is_favorite',
@@ -15,10 +22,12 @@ class PlanetSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['created_at'] = get_local_datetime(instance.created_at)
-        representation['updated_at'] = get_local_datetime(instance.updated_at)
+        if self.is_requested('created_at'):
+            representation['created_at'] = get_local_datetime(instance.created_at)
+        if self.is_requested('updated_at'):
+            representation['updated_at'] = get_local_datetime(instance.updated_at)
 
-        if self.context.get("from_list_view"):
+        if self.context.get("from_list_view") and self.is_requested('url'):
             representation['url'] = self.context["request"].build_absolute_uri(
                 reverse("planet_detail", args=(instance.pk,))
             )
@@ -26,17 +35,37 @@ class PlanetSerializer(serializers.ModelSerializer):
         return representation
 
 
+class PlanetListSerializer(ValuesListSerializer):
+    serializer_class = PlanetSerializer
+    detail_url_name = "planet_detail"
+
+
 class PlanetFavoriteSerializer(serializers.Serializer):
     custom_name = serializers.CharField(max_length=50, required=False)
 
     def create(self, validated_data):
-        planet = self.context.get('planet')
-        planet.is_favorite = True
+        # The URL capture is a string, and `bulk_write` receivers look rows up by their integer pk.
+        planet_id = int(self.context['planet_id'])
+        fields = {"is_favorite": True, "updated_at": timezone.now()}
 
         custom_name = validated_data.get("custom_name")
         if custom_name:
-            planet.custom_name = custom_name
+            fields["custom_name"] = custom_name
+
+        # A single conditional UPDATE: no read-modify-write round trip, and no
+        # lost update when two requests favorite the same planet concurrently.
+        if not Planet.objects.filter(id=planet_id).update(**fields):
+            raise Http404("No Planet matches the given query.")
+        bulk_write.send(sender=Planet, pks=[planet_id])
+
+        if not custom_name:
+            # The response shows the custom name, which this request did not set.
+            fields["custom_name"] = Planet.objects.filter(id=planet_id).values_list("custom_name", flat=True).first()
 
-        planet.save(update_fields=["is_favorite", "custom_name", "updated_at"])
+        return Planet(id=planet_id, **fields)
 
-        return planet
+
+class PlanetBulkFavoriteSerializer(FavoriteItemSerializer):
+
+    class Meta(FavoriteItemSerializer.Meta):
+        model = Planet
@@ -1,13 +1,14 @@
 import json
 
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
 
 from planets.models import Planet
+from utils.testing import CatalogAPITestCase
 
 
-class PlanetListTest(APITestCase):
+class PlanetListTest(CatalogAPITestCase):
 
     @property
     def url(self) -> str:
@@ -107,8 +108,135 @@ class PlanetListTest(APITestCase):
         self.assertIsNotNone(first_planet['url'])
         self.assertTrue(first_planet['url'].endswith(reverse("planet_detail", args=(1,))))
 
+    def test_get_planet_list_with_limit_follows_next_cursor__success(self):
+        Planet.objects.create(name="Coruscant")
+        Planet.objects.create(name="Alderaan")
+        Planet.objects.create(name="Hoth")
+
+        response = self.client.get(f'{self.url}?limit=2&ordering=name')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], 'Planet list fetched successfully.')
+        self.assertEqual([planet['name'] for planet in response_body['planets']], ["Alderaan", "Coruscant"])
+        self.assertIsNotNone(response_body['next'])
+
+        response = self.client.get(self.url, data={"limit": 2, "cursor": response_body['next']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual([planet['name'] for planet in response_body['planets']], ["Hoth"])
+        self.assertIsNone(response_body['next'])
 
-class PlanetDetailTest(APITestCase):
+    def test_get_planet_list_with_invalid_ordering__failure(self):
+        response = self.client.get(f'{self.url}?limit=2&ordering=is_favorite')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_planet_list_by_name_after_bulk_create__success(self):
+        Planet.objects.bulk_create([Planet(name="Tatooine"), Planet(name="Dantooine"), Planet(name="Hoth")])
+
+        response = self.client.get(f'{self.url}?name=TOOINE')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(sorted(planet['name'] for planet in response_body['planets']), ["Dantooine", "Tatooine"])
+
+    def test_get_planet_list_with_sparse_fields__success(self):
+        Planet.objects.create(name="Tatooine")
+
+        response = self.client.get(f'{self.url}?fields=name,url&limit=5')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_body = json.loads(response.content)
+        detail_url = f"http://testserver{reverse('planet_detail', args=(1,))}"
+        self.assertEqual(response_body['planets'], [{"name": "Tatooine", "url": detail_url}])
+
+        response = self.client.get(f'{self.url}?fields=name,id')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', json.loads(response.content))
+
+    def test_get_planet_list_filtered_by_is_favorite__success(self):
+        Planet.objects.create(name="Tatooine", is_favorite=True)
+        Planet.objects.create(name="Alderaan")
+        Planet.objects.create(name="Hoth", is_favorite=True)
+
+        response_body = json.loads(self.client.get(f'{self.url}?is_favorite=true&ordering=name&limit=5').content)
+        self.assertEqual([planet['name'] for planet in response_body['planets']], ["Hoth", "Tatooine"])
+
+        response_body = json.loads(self.client.get(f'{self.url}?is_favorite=false&ordering=name&limit=5').content)
+        self.assertEqual([planet['name'] for planet in response_body['planets']], ["Alderaan"])
+
+        response = self.client.get(f'{self.url}?is_favorite=maybe')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), {"is_favorite": ["Must be a valid boolean."]})
+
+    def test_get_planet_list_by_ids__success(self):
+        Planet.objects.create(name="Tatooine", is_favorite=True)
+        Planet.objects.create(name="Alderaan")
+
+        response_body = json.loads(self.client.get(f'{self.url}?ids=2,1,7&is_favorite=true').content)
+        self.assertEqual([planet['name'] for planet in response_body['planets']], ["Tatooine"])
+        self.assertEqual(response_body['missing'], [2, 7])
+
+    def test_get_planet_list_with_matching_etag__not_modified(self):
+        Planet.objects.create(name="Hoth")
+
+        response = self.client.get(self.url)
+        etag = response.headers['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Planet.objects.get().delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['msg'], 'Empty planet list.')
+
+
+class PlanetBulkTest(CatalogAPITestCase):
+
+    def test_bulk_create_planets_from_ndjson__success(self):
+        payload = '{"name": "Tatooine"}\n{"name": "Hoth", "is_favorite": true}\n'
+        response = self.client.post(reverse('planets_bulk'), data=payload, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Planets created successfully.")
+        self.assertEqual(response_body['details']['created'], 2)
+        self.assertEqual(list(Planet.objects.filter(is_favorite=True).values_list('name', flat=True)), ["Hoth"])
+
+
+class PlanetExportTest(CatalogAPITestCase):
+
+    def test_export_planets_as_csv__success(self):
+        Planet.objects.create(name="Hoth", is_favorite=True)
+        Planet.objects.create(name="Tatooine")
+
+        response = self.client.get(reverse('planets_export', args=('csv',)), {'is_favorite': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.headers['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response.headers['Content-Disposition'], 'attachment; filename="planets.csv"')
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,is_favorite,created_at,updated_at")
+        self.assertEqual([line.split(',')[:3] for line in lines[1:]], [['2', 'Tatooine', 'false']])
+
+
+@override_settings(CHANGE_FEED={'SETTLE_SECONDS': 0, 'RETENTION_DAYS': 30})
+class PlanetChangesTest(CatalogAPITestCase):
+
+    def test_planet_changes_with_sparse_fields__success(self):
+        Planet.objects.create(name="Hoth")
+        Planet.objects.create(name="Tatooine")
+        Planet.objects.filter(name="Hoth").delete()
+
+        response = self.client.get(reverse('planets_changes'), {'fields': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['planets'], [{'name': 'Tatooine', 'url': 'http://testserver/planets/2/'}])
+        self.assertEqual((data['deleted'], data['has_more']), ([1], False))
+
+
+class PlanetDetailTest(CatalogAPITestCase):
 
     def url(self, id: int) -> str:
         return reverse('planet_detail', args=(id,))
@@ -131,8 +259,18 @@ class PlanetDetailTest(APITestCase):
         self.assertIsNotNone(response_body['details']['created_at'])
         self.assertIsNotNone(response_body['details']['updated_at'])
 
+    def test_get_planet_detail_with_sparse_fields__success(self):
+        Planet.objects.create(name="Tatooine")
+
+        self.client.get(self.url(id=1))
+        # The cached instance of the full representation serves every sparse fieldset.
+        with self.assertNumQueries(0):
+            response = self.client.get(f"{self.url(id=1)}?fields=name,created_at")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(json.loads(response.content)['details']), ["name", "created_at"])
 
-class PlanetFavoriteTest(APITestCase):
+
+class PlanetFavoriteTest(CatalogAPITestCase):
 
     def url(self, id: int) -> str:
         return reverse('planet_favorite', args=(id, ))
@@ -165,3 +303,54 @@ class PlanetFavoriteTest(APITestCase):
         planet.refresh_from_db()
         self.assertTrue(planet.is_favorite)
         self.assertEqual(planet.custom_name, custom_name)
+
+
+class PlanetBulkFavoriteTest(CatalogAPITestCase):
+
+    def test_bulk_favorite_planets__success(self):
+        Planet.objects.create(name="Coruscant")
+        Planet.objects.create(name="Hoth")
+
+        payload = [{"id": 2}, {"id": 7}, {"id": 1, "custom_name": "City"}]
+        response = self.client.post(reverse('planets_bulk_favorite'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response_body = json.loads(response.content)
+        self.assertEqual(response_body['msg'], "Favorite planets added.")
+        self.assertEqual(response_body['details'], {"favorited": [1, 2], "missing": [7]})
+        self.assertEqual(
+            list(Planet.objects.order_by('id').values_list('is_favorite', 'custom_name')),
+            [(True, "City"), (True, None)],
+        )
+
+
+class PlanetAsyncViewTest(CatalogAPITestCase):
+
+    def test_async_views_match_sync_views__success(self):
+        Planet.objects.create(name="Tatooine")
+        Planet.objects.create(name="Hoth")
+
+        for sync_url, async_url in [
+            (reverse('planets_list'), reverse('planets_list_async')),
+            (f"{reverse('planets_list')}?limit=1", f"{reverse('planets_list_async')}?limit=1"),
+            (reverse('planet_detail', args=(1,)), reverse('planet_detail_async', args=(1,))),
+        ]:
+            response = self.client.get(async_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content), json.loads(self.client.get(sync_url).content))
+
+    def test_async_detail_when_id_is_invalid__failure(self):
+        response = self.client.get(reverse('planet_detail_async', args=(1,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content), {"detail": "Not found."})
+
+    def test_async_favorite__success(self):
+        Planet.objects.create(name="Hoth")
+
+        response = self.client.post(reverse('planet_favorite_async', args=(1,)), data={"custom_name": "Echo Base"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content)['details'], {"custom_name": "Echo Base"})
+        self.assertTrue(Planet.objects.get(id=1).is_favorite)
+
+        response = self.client.post(reverse('planet_favorite_async', args=(2,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
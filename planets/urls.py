@@ -1,8 +1,19 @@
 from django.urls import re_path
 
-from planets.views import PlanetDetailView, PlanetFavoriteView, PlanetView
+from planets.async_views import (PlanetAsyncDetailView,
+                                 PlanetAsyncFavoriteView, PlanetAsyncView)
+from planets.views import (PlanetBulkFavoriteView, PlanetBulkView,
+                           PlanetChangesView, PlanetDetailView,
+                           PlanetExportView, PlanetFavoriteView, PlanetView)
 
 urlpatterns = [
+    re_path(r'^async/(?P<id>[0-9]+)/favorite/$', PlanetAsyncFavoriteView.as_view(), name="planet_favorite_async"),
+    re_path(r'^async/(?P<id>[0-9]+)/$', PlanetAsyncDetailView.as_view(), name="planet_detail_async"),
+    re_path(r'^async/$', PlanetAsyncView.as_view(), name="planets_list_async"),
+    re_path(r'^changes/$', PlanetChangesView.as_view(), name="planets_changes"),
+    re_path(r'^export\.(?P<export_format>ndjson|csv)$', PlanetExportView.as_view(), name="planets_export"),
+    re_path(r'^bulk/$', PlanetBulkView.as_view(), name="planets_bulk"),
+    re_path(r'^favorite/$', PlanetBulkFavoriteView.as_view(), name="planets_bulk_favorite"),
     re_path(r'(?P<id>[0-9]+)/favorite/', PlanetFavoriteView.as_view(), name="planet_favorite"),
     re_path(r'(?P<id>[0-9]+)/', PlanetDetailView.as_view(), name="planet_detail"),
     re_path(r'', PlanetView.as_view(), name="planets_list"),
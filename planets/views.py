@@ -1,38 +1,95 @@
+from django.db.models import QuerySet
 from django.http.request import HttpRequest
-from django.http.response import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http.response import HttpResponseBase, JsonResponse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.views import APIView
 
+from catalog.feed import read_changes
 from planets.models import Planet
-from planets.serializers import PlanetFavoriteSerializer, PlanetSerializer
+from planets.serializers import (PlanetBulkFavoriteSerializer,
+                                 PlanetFavoriteSerializer,
+                                 PlanetListSerializer, PlanetSerializer)
+from utils.cache import cache_response
+from utils.conditional import ConditionalGet
+from utils.export import StreamingExportResponse, get_export_columns
+from utils.helpers import (filter_by_favorite, filter_by_updated_since,
+                           get_bool_query_param, get_ids_query_param,
+                           order_rows_by_ids)
+from utils.objects import object_cache
+from utils.pagination import KeysetPaginator
+from utils.parsers import NDJSONParser
+from utils.search import search_queryset
+from utils.serializers import get_sparse_fields
+from utils.sqlite import write_lock
+from utils.streaming import JsonListResponse, StreamingJsonListResponse
+from utils.timing import timed
 
 
 class PlanetView(APIView):
+    read_from_replica = True
 
-    def get(self, request: HttpRequest) -> JsonResponse:
-        filter_by_fields = {}
+    @cache_response(Planet)
+    def get(self, request: HttpRequest) -> HttpResponseBase:
+        planets = Planet.objects.all()
         filter_by_name = request.GET.get('name')
         if filter_by_name:
-            filter_by_fields["name__icontains"] = filter_by_name
+            planets = search_queryset(planets, 'name', filter_by_name)
+        planets = filter_by_favorite(planets, request)
+        ids = get_ids_query_param(request)
+        if ids is not None:
+            planets = planets.filter(id__in=ids)
 
-        planets = Planet.objects.filter(**filter_by_fields)
-        planet_serializer = PlanetSerializer(
-            planets,
-            many=True,
-            context={'request': request, "from_list_view": True}
-        )
+        conditional_get = ConditionalGet.for_queryset(request, planets)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
 
-        data = {
-            "msg": "Planet list fetched successfully." if planet_serializer.data else "Empty planet list.",
-            "planets": planet_serializer.data,
-        }
-        return JsonResponse(status=status.HTTP_200_OK, data=data)
+        list_serializer = PlanetListSerializer(request, get_sparse_fields(request, PlanetSerializer, extra=('url',)))
+        planets = list_serializer.get_rows(planets)
+
+        paginator = KeysetPaginator(request)
+        extra = {}
+        if ids is not None:
+            if paginator.is_enabled:
+                raise ValidationError({'ids': ["Cannot be combined with limit or cursor."]})
+            # Rows come back in index order, so they are put in the requested one.
+            planets, extra["missing"] = order_rows_by_ids(planets, ids)
+        elif paginator.is_enabled:
+            planets = paginator.paginate_queryset(planets, list_serializer.row_position)
+            extra["next"] = paginator.next_cursor
+
+        if get_bool_query_param(request, 'stream'):
+            if isinstance(planets, QuerySet):
+                # The rows are read after the view has returned, outside of the request's database routing.
+                planets = planets.using(planets.db)
+            return conditional_get.apply(StreamingJsonListResponse(
+                list_serializer.to_encoded_rows(planets),
+                key="planets",
+                msg="Planet list fetched successfully.",
+                empty_msg="Empty planet list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            ))
+
+        planet_list = list(list_serializer.to_encoded_rows(planets))
+        with timed('encode'):
+            response = JsonListResponse(
+                planet_list,
+                key="planets",
+                msg="Planet list fetched successfully.",
+                empty_msg="Empty planet list.",
+                extra=extra,
+                status=status.HTTP_200_OK,
+            )
+        return conditional_get.apply(response)
 
     def post(self, request: HttpRequest) -> JsonResponse:
         planet_serializer = PlanetSerializer(data=request.POST)
         planet_serializer.is_valid(raise_exception=True)
-        planet_serializer.save()
+        with write_lock:
+            planet_serializer.save()
         data = {
             "msg": "Planet created successfully.",
             "details": planet_serializer.data,
@@ -40,27 +97,115 @@ class PlanetView(APIView):
         return JsonResponse(status=status.HTTP_201_CREATED, data=data)
 
 
-class PlanetDetailView(APIView):
+class PlanetChangesView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest) -> HttpResponseBase:
+        fields = get_sparse_fields(request, PlanetSerializer, extra=('url',))
+        if fields is not None:
+            # Clients match changed rows to their copies by `url`, so it is always rendered.
+            fields = tuple(dict.fromkeys((*fields, 'url')))
+        list_serializer = PlanetListSerializer(request, fields)
+        page = read_changes(request, list_serializer.get_rows(Planet.objects.all()), list_serializer.row_position)
+
+        planet_list = list(list_serializer.to_encoded_rows(page.rows))
+        with timed('encode'):
+            response = JsonListResponse(
+                planet_list,
+                key="planets",
+                msg="Planet changes fetched successfully.",
+                empty_msg="No changed planets.",
+                extra={"deleted": page.deleted, "watermark": page.watermark, "has_more": page.has_more},
+                status=status.HTTP_200_OK,
+            )
+        return response
+
+
+class PlanetExportView(APIView):
+    read_from_replica = True
+
+    def get(self, request: HttpRequest, export_format: str) -> HttpResponseBase:
+        planets = Planet.objects.all()
+        filter_by_name = request.GET.get('name')
+        if filter_by_name:
+            planets = search_queryset(planets, 'name', filter_by_name)
+        planets = filter_by_favorite(planets, request)
+        # Oldest change first, so the last row's `updated_at` is the next `updated_since`.
+        planets = filter_by_updated_since(planets, request).order_by('updated_at', 'id')
+
+        return StreamingExportResponse(
+            planets, get_export_columns(PlanetSerializer), export_format, filename="planets", status=status.HTTP_200_OK
+        )
+
+
+class PlanetBulkView(APIView):
+    parser_classes = [JSONParser, NDJSONParser]
 
-    def get(self, request: HttpRequest, id: str) -> JsonResponse:
-        planet = get_object_or_404(Planet, id=id)
-        planet_serializer = PlanetSerializer(planet)
+    def post(self, request: HttpRequest) -> JsonResponse:
+        planet_serializer = PlanetSerializer(data=request.data, many=True)
+        if not planet_serializer.is_valid():
+            data = {
+                "msg": "Planets not created.",
+                "errors": planet_serializer.get_item_errors(),
+            }
+            return JsonResponse(status=status.HTTP_400_BAD_REQUEST, data=data)
+
+        with write_lock:
+            planets = planet_serializer.save()
         data = {
-            "msg": "Planet details fetched successfully.",
-            "details": planet_serializer.data,
+            "msg": "Planets created successfully.",
+            "details": {"created": len(planets)},
         }
-        return JsonResponse(status=status.HTTP_200_OK, data=data)
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
+
+
+class PlanetDetailView(APIView):
+    read_from_replica = True
+
+    @cache_response(Planet)
+    def get(self, request: HttpRequest, id: str) -> HttpResponseBase:
+        fields = get_sparse_fields(request, PlanetSerializer)
+        # Full rows, so that one cached instance serves every sparse fieldset.
+        planet = object_cache.get_or_404(Planet, id)
+        conditional_get = ConditionalGet.for_instance(request, planet)
+        not_modified_response = conditional_get.get_not_modified_response()
+        if not_modified_response is not None:
+            return not_modified_response
+
+        with timed('serialize'):
+            planet_serializer = PlanetSerializer(planet, context={'fields': fields})
+            data = {
+                "msg": "Planet details fetched successfully.",
+                "details": planet_serializer.data,
+            }
+        with timed('encode'):
+            response = JsonResponse(status=status.HTTP_200_OK, data=data)
+        return conditional_get.apply(response)
 
 
 class PlanetFavoriteView(APIView):
 
     def post(self, request: HttpRequest, id: str) -> JsonResponse:
-        planet = get_object_or_404(Planet, id=id)
-        planet_serializer = PlanetFavoriteSerializer(data=request.POST, context={'planet': planet})
+        planet_serializer = PlanetFavoriteSerializer(data=request.POST, context={'planet_id': id})
         planet_serializer.is_valid(raise_exception=True)
-        planet_serializer.save()
+        with write_lock:
+            planet_serializer.save()
         data = {
             "msg": "Favorite planet added.",
             "details": planet_serializer.data,
         }
         return JsonResponse(status=status.HTTP_201_CREATED, data=data)
+
+
+class PlanetBulkFavoriteView(APIView):
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        planet_serializer = PlanetBulkFavoriteSerializer(data=request.data, many=True)
+        planet_serializer.is_valid(raise_exception=True)
+        with write_lock:
+            favorites = planet_serializer.save()
+        data = {
+            "msg": "Favorite planets added.",
+            "details": favorites,
+        }
+        return JsonResponse(status=status.HTTP_201_CREATED, data=data)
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.core.management import call_command
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotdraft.settings')
 
 application = get_asgi_application()
+
+# The object cache is per process, so every worker preloads its own.
+if settings.OBJECT_CACHE['WARM_ON_START']:
+    call_command('warm_object_cache')
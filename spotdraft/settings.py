@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,9 +44,11 @@ INSTALLED_APPS = [
 
     'planets',
     'movies',
+    'catalog',
 ]
 
 MIDDLEWARE = [
+    'utils.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'utils.replica.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'spotdraft.urls'
@@ -83,7 +87,67 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # Read-only copy of `default`, refreshed by `python manage.py refresh_replica --interval <seconds>`
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['utils.replica.ReplicaRouter']
+
+# Reads of the views with `read_from_replica = True` go to ALIAS, enabled with READ_REPLICA=1.
+# A client's reads stay on `default` for STICKY_SECONDS after each of its writes, which has to
+# cover REFRESH_INTERVAL plus the time a refresh takes.
+READ_REPLICA = {
+    'ENABLED': os.environ.get('READ_REPLICA') == '1',
+    'ALIAS': 'replica',
+    'REFRESH_INTERVAL': 5,
+    'STICKY_SECONDS': 15,
+}
+
+# Production SQLite profile, enabled with the environment variable SQLITE_PROFILE=production:
+# PRAGMAS run on every new connection, connections are kept for CONN_MAX_AGE seconds and the
+# writers of a process queue on `utils.sqlite.write_lock`.
+SQLITE_PROFILE = {
+    'ENABLED': os.environ.get('SQLITE_PROFILE') == 'production',
+    'CONN_MAX_AGE': 600,
+    'PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+if SQLITE_PROFILE['ENABLED']:
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = SQLITE_PROFILE['CONN_MAX_AGE']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Encoded list/detail responses. With several workers, point this at a shared backend,
+    # e.g. 'django.core.cache.backends.filebased.FileBasedCache' with a common LOCATION.
+    'responses': {
+        'BACKEND': 'utils.cache.LRUMemoryCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'MAX_BYTES': 64 * 1024 * 1024,
+        },
+    },
 }
 
 
@@ -128,6 +192,80 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Keyset pagination for the list endpoints, enabled per request via `limit`/`cursor`
+CURSOR_PAGINATION = {
+    'DEFAULT_LIMIT': 50,
+    'MAX_LIMIT': 500,
+}
+
+# `/changes/` feeds: rows are only served once older than SETTLE_SECONDS (the SQLite busy_timeout), so a
+# write still waiting for the lock cannot commit behind a watermark; tombstones are kept for RETENTION_DAYS
+CHANGE_FEED = {
+    'SETTLE_SECONDS': 5,
+    'RETENTION_DAYS': 30,
+}
+
+# Movie and planet instances kept per process for the detail views; TTL_SECONDS None keeps them until a
+# write (in any process: entries are checked against the `responses` cache generation) or an eviction.
+# With WARM_OBJECT_CACHE=1 every worker preloads WARM_ROWS per model at start
+OBJECT_CACHE = {
+    'MAX_ENTRIES': 10_000,
+    'TTL_SECONDS': None,
+    'WARM_ON_START': os.environ.get('WARM_OBJECT_CACHE') == '1',
+    'WARM_ROWS': 1000,
+}
+
+# `/catalog/autocomplete/`: suggestions per request, and how often each process checks its in-memory
+# name index against the database for writes made by other processes
+AUTOCOMPLETE = {
+    'DEFAULT_LIMIT': 10,
+    'MAX_LIMIT': 50,
+    'CHECK_INTERVAL_SECONDS': 60,
+}
+
+# `?ids=` batch lookups on the list endpoints
+BATCH_LOOKUP = {
+    'MAX_IDS': 100,
+}
+
+# `?stream=true` list responses and exports: rows fetched per DB round trip and rows encoded per write
+STREAMING_LIST = {
+    'CHUNK_SIZE': 2000,
+    'ROWS_PER_WRITE': 100,
+}
+
+# Encoded list rows kept per process, keyed on (pk, updated_at); about 200 bytes per row
+ROW_FRAGMENT_CACHE = {
+    'MAX_BYTES': 32 * 1024 * 1024,
+}
+
+# Bulk endpoints: rows per INSERT/UPDATE statement
+BULK_WRITE = {
+    'BATCH_SIZE': 500,
+}
+
+# Share of requests that get a `Server-Timing` header and a JSON log line on the `utils.timing` logger
+SERVER_TIMING = {
+    'SAMPLE_RATE': float(os.environ.get('SERVER_TIMING_SAMPLE_RATE', 0.05)),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'utils.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # Use nose to run all tests
 TEST_RUNNER = 'django_nose.NoseTestSuiteRunner'
 
@@ -20,4 +20,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('planets/', include('planets.urls')),
     path('movies/', include('movies.urls')),
+    path('catalog/', include('catalog.urls')),
 ]
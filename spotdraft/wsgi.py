@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.core.management import call_command
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotdraft.settings')
 
 application = get_wsgi_application()
+
+# The object cache is per process, so every worker preloads its own.
+if settings.OBJECT_CACHE['WARM_ON_START']:
+    call_command('warm_object_cache')
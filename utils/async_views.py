@@ -0,0 +1,51 @@
+from django.http import Http404
+from django.http.request import HttpRequest
+from django.http.response import (HttpResponseBase, HttpResponseNotAllowed,
+                                  JsonResponse)
+from rest_framework import exceptions
+
+
+class AsyncAPIView:
+    """
+    Minimal coroutine counterpart of DRF's ``APIView`` for the ASGI deployment.
+
+    Django 4.0's ``View`` cannot dispatch to ``async def`` handlers and DRF's
+    ``APIView`` is synchronous, so this dispatches by HTTP method itself and
+    renders ``APIException``/``Http404`` the way DRF's exception handler does.
+    Like ``APIView``, the resulting view is CSRF exempt.
+    """
+
+    http_method_names = ('get', 'post')
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        async def view(request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+            self = cls(**initkwargs)
+            return await self.dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.csrf_exempt = True
+        return view
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if handler is None:
+            return HttpResponseNotAllowed([name.upper() for name in self.http_method_names if hasattr(self, name)])
+
+        try:
+            return await handler(request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            return self.handle_exception(exc)
+
+    @staticmethod
+    def handle_exception(exc: Exception) -> JsonResponse:
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound()
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        return JsonResponse(status=exc.status_code, data=data, safe=False)
@@ -0,0 +1,241 @@
+import bisect
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from utils.helpers import batched
+from utils.signals import bulk_write
+
+# A write can commit up to the SQLite busy_timeout after it took its `updated_at`, so syncs re-read that far back.
+SYNC_OVERLAP = timedelta(seconds=5)
+# Above this many entries, one pass over the index beats a bisect and a list shift per entry.
+MERGE_THRESHOLD = 32
+
+
+class Suggestion(NamedTuple):
+    type: str
+    pk: int
+    field: str
+    text: str
+
+
+def get_keys(text: str) -> List[str]:
+    """``text`` casefolded, from the start of each of its words."""
+    folded = text.casefold()
+    return [
+        folded[index:] for index, char in enumerate(folded)
+        if not char.isspace() and (index == 0 or folded[index - 1].isspace())
+    ]
+
+
+class AutocompleteIndex:
+    """
+    Process-local prefix index of some text columns of the watched models.
+
+    Every word start of every indexed value is a casefolded key in one sorted
+    list, so a lookup is a ``bisect`` and a walk over the matching keys that
+    never touches the database. A model is read in full on the first lookup;
+    after that, this process's own writes are applied once committed
+    (``post_save``, ``post_delete`` and ``bulk_write``), and every
+    ``AUTOCOMPLETE['CHECK_INTERVAL_SECONDS']`` a lookup starts a background
+    ``check`` that picks up the writes of other processes.
+    """
+
+    def __init__(self):
+        # Watched models and their indexed columns, by model name.
+        self.models: Dict[str, Tuple[Type[models.Model], Tuple[str, ...]]] = {}
+        self._entries: List[Tuple[str, str, int, int]] = []  # (key, type, pk, field index), sorted
+        self._rows: Dict[Tuple[str, int], tuple] = {}  # (type, pk) -> indexed values
+        self._row_counts = Counter()
+        # Lower bound of the next `sync` of every model read so far; None to read everything.
+        self._synced_since: Dict[str, Optional[datetime]] = {}
+        self._checked_at = 0.0
+        self._checking = False
+        self._lock = threading.RLock()
+
+    def watch(self, model: Type[models.Model], fields: Tuple[str, ...]) -> None:
+        type = model._meta.model_name
+        self.models[type] = (model, fields)
+
+        def save_receiver(sender, instance, using, **kwargs):
+            row = (instance.pk, *(getattr(instance, name) for name in fields))
+            transaction.on_commit(lambda: self._apply(type, [row]), using=using)
+
+        def delete_receiver(sender, instance, using, **kwargs):
+            # The instance's pk is cleared once the delete is done.
+            pk = instance.pk
+            transaction.on_commit(lambda: self._apply(type, [], removed=[pk]), using=using)
+
+        def bulk_write_receiver(sender, pks=None, **kwargs):
+            # Without pks (a bulk_create on SQLite) the new rows are found by their `updated_at`.
+            pks = None if pks is None else list(pks)
+            transaction.on_commit(lambda: self.sync(type) if pks is None else self.refresh(type, pks))
+
+        post_save.connect(save_receiver, sender=model, weak=False, dispatch_uid='autocomplete_index')
+        post_delete.connect(delete_receiver, sender=model, weak=False, dispatch_uid='autocomplete_index')
+        bulk_write.connect(bulk_write_receiver, sender=model, weak=False, dispatch_uid='autocomplete_index')
+
+    def stats(self) -> dict:
+        return {
+            'keys': len(self._entries),
+            'rows': dict(self._row_counts),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = []
+            self._rows.clear()
+            self._row_counts.clear()
+            self._synced_since.clear()
+            self._checked_at = 0.0
+
+    def lookup(self, prefix: str, limit: int) -> List[Suggestion]:
+        """
+        Up to ``limit`` rows with a word of an indexed value starting with
+        ``prefix`` (case-insensitively), ordered by the matched text.
+        """
+        for type in self.models.keys() - self._synced_since.keys():
+            self.rebuild(type)
+        self._start_due_check()
+
+        key = prefix.strip().casefold()
+        if not key:
+            return []
+
+        suggestions, seen = [], set()
+        with self._lock:
+            entries = self._entries
+            index = bisect.bisect_left(entries, (key,))
+            while index < len(entries) and len(suggestions) < limit and entries[index][0].startswith(key):
+                _, type, pk, field_index = entries[index]
+                index += 1
+                if (type, pk) not in seen:
+                    seen.add((type, pk))
+                    suggestions.append(Suggestion(
+                        type, pk, self.models[type][1][field_index], self._rows[type, pk][field_index]
+                    ))
+        return suggestions
+
+    def rebuild(self, type: str) -> None:
+        """Read every row of the model named ``type`` and replace its part of the index."""
+        model, fields = self.models[type]
+        rows = list(model.objects.values_list('id', 'updated_at', *fields))
+        new_entries = [entry for pk, _, *values in rows for entry in self._get_entries(type, pk, values)]
+        latest = max((updated_at for _, updated_at, *_ in rows), default=None)
+
+        with self._lock:
+            self._entries = sorted([entry for entry in self._entries if entry[1] != type] + new_entries)
+            self._rows = {row: values for row, values in self._rows.items() if row[0] != type}
+            self._rows.update(((type, pk), tuple(values)) for pk, _, *values in rows)
+            self._row_counts[type] = len(rows)
+            self._synced_since[type] = None if latest is None else latest - SYNC_OVERLAP
+            self._checked_at = time.monotonic()
+
+    def sync(self, type: str) -> None:
+        """Apply the rows of ``type`` written since the last read (deletions are left to ``check``)."""
+        if type not in self._synced_since:
+            return
+        model, fields = self.models[type]
+        queryset = model.objects.all()
+        since = self._synced_since[type]
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+        rows = list(queryset.values_list('id', 'updated_at', *fields))
+        self._apply(type, [(pk, *values) for pk, _, *values in rows])
+        if rows:
+            synced_since = max(updated_at for _, updated_at, *_ in rows) - SYNC_OVERLAP
+            with self._lock:
+                self._synced_since[type] = synced_since if since is None else max(since, synced_since)
+
+    def refresh(self, type: str, pks: Iterable[int]) -> None:
+        """Read the rows ``pks`` of ``type`` again."""
+        if type not in self._synced_since:
+            return
+        model, fields = self.models[type]
+        for batch in batched(pks, settings.BULK_WRITE['BATCH_SIZE']):
+            rows = list(model.objects.filter(id__in=batch).values_list('id', *fields))
+            found = {row[0] for row in rows}
+            self._apply(type, rows, removed=[pk for pk in batch if pk not in found])
+
+    def check(self) -> List[str]:
+        """
+        Catch up with the writes this process did not see: ``sync`` every
+        model, and rebuild the ones whose row count still differs (deletions).
+        Returns the names of the rebuilt models.
+        """
+        rebuilt = []
+        for type in list(self._synced_since):
+            self.sync(type)
+            if self.models[type][0].objects.count() != self._row_counts[type]:
+                self.rebuild(type)
+                rebuilt.append(type)
+        return rebuilt
+
+    def _start_due_check(self) -> None:
+        with self._lock:
+            due = time.monotonic() - self._checked_at >= settings.AUTOCOMPLETE['CHECK_INTERVAL_SECONDS']
+            if not due or self._checking:
+                return
+            self._checking = True
+            self._checked_at = time.monotonic()
+
+        def run():
+            try:
+                self.check()
+            finally:
+                self._checking = False
+                connections.close_all()
+
+        threading.Thread(target=run, name='autocomplete-check', daemon=True).start()
+
+    def _apply(self, type: str, rows: Iterable[tuple], removed: Iterable[int] = ()) -> None:
+        """Replace the entries of ``rows`` (``(pk, *values)``) and drop the ones of the ``removed`` pks."""
+        if type not in self._synced_since:
+            return
+        rows = list(rows)
+        with self._lock:
+            stale = []
+            for pk in (*removed, *(row[0] for row in rows)):
+                values = self._rows.pop((type, pk), None)
+                if values is not None:
+                    self._row_counts[type] -= 1
+                    stale += self._get_entries(type, pk, values)
+            new_entries = []
+            for pk, *values in rows:
+                self._rows[type, pk] = tuple(values)
+                self._row_counts[type] += 1
+                new_entries += self._get_entries(type, pk, values)
+
+            entries = self._entries
+            if len(stale) > MERGE_THRESHOLD:
+                stale = set(stale)
+                entries = self._entries = [entry for entry in entries if entry not in stale]
+            else:
+                for entry in stale:
+                    index = bisect.bisect_left(entries, entry)
+                    if index < len(entries) and entries[index] == entry:
+                        del entries[index]
+            if len(new_entries) > MERGE_THRESHOLD:
+                # Two sorted runs: Timsort merges them in one pass.
+                entries += sorted(new_entries)
+                entries.sort()
+            else:
+                for entry in new_entries:
+                    bisect.insort(entries, entry)
+
+    @staticmethod
+    def _get_entries(type: str, pk: int, values) -> List[Tuple[str, str, int, int]]:
+        return [
+            (key, type, pk, field_index)
+            for field_index, value in enumerate(values) if value
+            for key in get_keys(value)
+        ]
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,194 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from typing import Callable, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from utils.replica import get_read_alias, is_reading_from_replica
+from utils.signals import bulk_write
+
+# Process-wide bookkeeping of LRUMemoryCache, keyed by cache alias like LocMemCache's own storage.
+_sizes = {}
+_stats = {}
+
+
+class LRUMemoryCache(LocMemCache):
+    """
+    ``LocMemCache`` that evicts least recently used entries once either
+    ``MAX_ENTRIES`` or ``MAX_BYTES`` (total pickled size) would be exceeded,
+    and counts its evictions.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._max_bytes = int(params.get('OPTIONS', {}).get('MAX_BYTES', 64 * 1024 * 1024))
+        self._sizes = _sizes.setdefault(name, {})
+        self._stats = _stats.setdefault(name, {'bytes': 0, 'evictions': 0})
+
+    @property
+    def evictions(self) -> int:
+        return self._stats['evictions']
+
+    @property
+    def size(self) -> int:
+        return self._stats['bytes']
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._delete(key)
+        while self._cache and (
+            len(self._cache) >= self._max_entries or self._stats['bytes'] + len(value) > self._max_bytes
+        ):
+            # Recently used keys are moved to the front, so the last one is the LRU.
+            self._delete(next(reversed(self._cache)))
+            self._stats['evictions'] += 1
+
+        self._cache[key] = value
+        self._cache.move_to_end(key, last=False)
+        self._expire_info[key] = self.get_backend_timeout(timeout)
+        self._sizes[key] = len(value)
+        self._stats['bytes'] += len(value)
+
+    def _delete(self, key):
+        deleted = super()._delete(key)
+        if deleted:
+            self._stats['bytes'] -= self._sizes.pop(key)
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._sizes.clear()
+            self._stats['bytes'] = 0
+
+
+class ResponseCache:
+    """
+    Cache of fully encoded GET responses, keyed on the database they were read
+    from and the absolute URL with its query parameters normalized, so that
+    clients pinned to ``default`` after a write never get a replica's response.
+
+    Every key embeds a per-model generation that is bumped by each write to the
+    model (``post_save``, ``post_delete`` and ``bulk_write``), so writes never
+    have to find the entries they make stale. The storage is the ``responses``
+    entry of ``CACHES``: ``LRUMemoryCache`` for a single worker, a shared
+    backend such as ``FileBasedCache`` for several.
+    """
+
+    def __init__(self, alias: str = 'responses'):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': getattr(self.cache, 'evictions', None),
+        }
+
+    def clear(self) -> None:
+        self.cache.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    @staticmethod
+    def _get_generation_key(model: Type[models.Model]) -> str:
+        return f"generation:{model._meta.label_lower}"
+
+    def get_generation(self, model: Type[models.Model]) -> int:
+        key = self._get_generation_key(model)
+        generation = self.cache.get(key)
+        if generation is None:
+            # Start from the clock so a lost counter never comes back at a value older entries used.
+            self.cache.add(key, time.time_ns(), timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def invalidate(self, model: Type[models.Model]) -> None:
+        key = self._get_generation_key(model)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), timeout=None)
+
+    def watch(self, model: Type[models.Model]) -> None:
+        """Invalidate the cached responses of ``model`` on every write to it."""
+        def receiver(sender, **kwargs):
+            # Bump right away for this process, and again once the new rows are visible to every reader.
+            self.invalidate(sender)
+            transaction.on_commit(lambda: self.invalidate(sender))
+
+        for signal in (post_save, post_delete, bulk_write):
+            signal.connect(receiver, sender=model, weak=False, dispatch_uid=f"response_cache_{self.alias}")
+
+    def get_key(self, request: HttpRequest, model: Type[models.Model]) -> str:
+        query = sorted((key, values) for key, values in request.GET.lists())
+        url_hash = hashlib.md5(f"{request.scheme}://{request.get_host()}{request.path}?{query}".encode()).hexdigest()
+        return f"response:{model._meta.label_lower}:{self.get_generation(model)}:{get_read_alias()}:{url_hash}"
+
+    def get_response(
+        self, request: HttpRequest, model: Type[models.Model], get_response: Callable
+    ) -> HttpResponseBase:
+        key = self.get_key(request, model)
+        entry = self.cache.get(key)
+
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            response = get_response()
+            if response.status_code == 200 and not response.streaming:
+                headers = {name: response.headers[name] for name in ('Content-Type', 'ETag', 'Last-Modified')
+                           if name in response.headers}
+                # A replica read may predate the writes that bumped the generation, so keep it only
+                # about as long as the replica can lag behind.
+                timeout = settings.READ_REPLICA['REFRESH_INTERVAL'] if is_reading_from_replica() else DEFAULT_TIMEOUT
+                self.cache.set(key, (response.status_code, response.content, headers), timeout=timeout)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        with self._lock:
+            self.hits += 1
+        status_code, content, headers = entry
+        response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+        )
+        if response is None:
+            response = HttpResponse(content, status=status_code, content_type=headers.get('Content-Type'))
+
+        for name in ('ETag', 'Last-Modified'):
+            if name in headers:
+                response.headers[name] = headers[name]
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+
+response_cache = ResponseCache()
+
+
+def cache_response(model: Type[models.Model]) -> Callable:
+    """Serve a view method's GET responses from ``response_cache``."""
+    def decorator(view_method: Callable) -> Callable:
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            return response_cache.get_response(request, model, lambda: view_method(view, request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,55 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Count, Max, Model, QuerySet
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGet:
+    """
+    ETag / Last-Modified validators derived from ``CustomBaseModel.updated_at``.
+
+    The ETag also covers the absolute URL of the request, since the query
+    string and the host both change the representation. Lists only get the
+    ETag: their latest ``updated_at`` does not move when rows are deleted or
+    fall out of the filter, and ``If-Modified-Since`` only has whole seconds.
+    """
+
+    def __init__(self, request: HttpRequest, version: str, last_modified: Optional[datetime]):
+        self.request = request
+        self.last_modified = last_modified
+
+        digest = hashlib.md5(f"{request.build_absolute_uri()}|{version}".encode()).hexdigest()
+        self.etag = f'"{digest}"'
+
+    @classmethod
+    def for_queryset(cls, request: HttpRequest, queryset: QuerySet) -> "ConditionalGet":
+        """Validate a list by its latest ``updated_at`` and its row count, in one aggregate query."""
+        aggregate = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        version = f"{aggregate['last_modified'] and aggregate['last_modified'].isoformat()}|{aggregate['count']}"
+        return cls(request, version, last_modified=None)
+
+    @classmethod
+    def for_instance(cls, request: HttpRequest, instance: Model) -> "ConditionalGet":
+        return cls(request, instance.updated_at.isoformat(), instance.updated_at)
+
+    def get_not_modified_response(self) -> Optional[HttpResponseBase]:
+        """Return a ``304 Not Modified`` when the client's copy is still current, else ``None``."""
+        response = get_conditional_response(
+            self.request,
+            etag=self.etag,
+            last_modified=self.last_modified and int(self.last_modified.timestamp()),
+        )
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response: HttpResponseBase) -> HttpResponseBase:
+        response.headers['ETag'] = self.etag
+        if self.last_modified:
+            response.headers['Last-Modified'] = http_date(self.last_modified.timestamp())
+        return response
@@ -0,0 +1,74 @@
+import csv
+import io
+from datetime import date
+from typing import Iterator, Sequence, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http.response import StreamingHttpResponse
+
+from utils.helpers import batched
+from utils.serializers import TIMESTAMP_FIELDS
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+_encoder = DjangoJSONEncoder()
+
+
+def get_export_columns(serializer_class) -> Tuple[str, ...]:
+    return ('id', *serializer_class.Meta.fields, *TIMESTAMP_FIELDS)
+
+
+def _to_csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, date):
+        # Dates and UTC timestamps are formatted exactly like in the NDJSON export.
+        return _encoder.default(value)
+    return value
+
+
+def iter_export(queryset: QuerySet, columns: Sequence[str], export_format: str) -> Iterator[bytes]:
+    """
+    Encode the ``columns`` of every row of ``queryset`` as NDJSON or CSV.
+
+    Rows are read with a server-side ``values_list().iterator()`` and encoded
+    ``ROWS_PER_WRITE`` at a time without going through a serializer, so memory
+    does not grow with the number of rows.
+    """
+    rows = queryset.values_list(*columns).iterator(chunk_size=settings.STREAMING_LIST['CHUNK_SIZE'])
+    batches = batched(rows, settings.STREAMING_LIST['ROWS_PER_WRITE'])
+
+    if export_format == 'ndjson':
+        encode = _encoder.encode
+        for batch in batches:
+            yield "".join(f"{encode(dict(zip(columns, row)))}\n" for row in batch).encode()
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_to_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class StreamingExportResponse(StreamingHttpResponse):
+    """Download of ``iter_export``, named ``<filename>.<export_format>``."""
+
+    def __init__(self, queryset: QuerySet, columns: Sequence[str], export_format: str, filename: str, **kwargs):
+        # The rows are read after the view has returned, outside of the request's database routing.
+        queryset = queryset.using(queryset.db)
+        kwargs.setdefault("content_type", EXPORT_CONTENT_TYPES[export_format])
+        super().__init__(iter_export(queryset, columns, export_format), **kwargs)
+        self.headers['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
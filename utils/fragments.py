@@ -0,0 +1,116 @@
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Type
+
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+
+from utils.signals import bulk_write
+
+
+class RowFragmentCache:
+    """
+    Process-local LRU of the JSON encoding of single list rows.
+
+    Keys are ``(model label, pk, updated_at, variant)``: every write that
+    changes a rendered column bumps ``updated_at``, so an edited row simply
+    misses and is encoded again while the rest of the list is reused as is.
+    ``post_save``, ``post_delete`` and ``bulk_write`` additionally drop the
+    fragments of the written rows, to give their memory back early. The total
+    size is bounded by ``ROW_FRAGMENT_CACHE['MAX_BYTES']``.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._keys_by_row = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.ROW_FRAGMENT_CACHE['MAX_BYTES']
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes': self.size,
+            'entries': len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_row.clear()
+            self.hits = self.misses = self.evictions = self.size = 0
+
+    def get_many(self, keys: List[tuple]) -> List[Optional[str]]:
+        """The fragment of every key, ``None`` for the ones not cached."""
+        entries = self._entries
+        with self._lock:
+            fragments = []
+            for key in keys:
+                fragment = entries.get(key)
+                if fragment is not None:
+                    entries.move_to_end(key)
+                fragments.append(fragment)
+            misses = fragments.count(None)
+            self.hits += len(fragments) - misses
+            self.misses += misses
+        return fragments
+
+    def set_many(self, fragments: Dict[tuple, str]) -> None:
+        max_bytes = self.max_bytes
+        with self._lock:
+            for key, fragment in fragments.items():
+                size = sys.getsizeof(fragment)
+                if size > max_bytes:
+                    continue
+                self._delete(key)
+                while self._entries and self.size + size > max_bytes:
+                    self._delete(next(iter(self._entries)))
+                    self.evictions += 1
+
+                self._entries[key] = fragment
+                self._keys_by_row[key[:2]].add(key)
+                self.size += size
+
+    def _delete(self, key: tuple) -> None:
+        fragment = self._entries.pop(key, None)
+        if fragment is None:
+            return
+        self.size -= sys.getsizeof(fragment)
+        row_keys = self._keys_by_row[key[:2]]
+        row_keys.discard(key)
+        if not row_keys:
+            del self._keys_by_row[key[:2]]
+
+    def invalidate(self, model: Type[models.Model], pks: Iterable[Hashable]) -> None:
+        label, to_python = model._meta.label_lower, model._meta.pk.to_python
+        with self._lock:
+            for pk in pks:
+                for key in list(self._keys_by_row.get((label, to_python(pk)), ())):
+                    self._delete(key)
+
+    def watch(self, model: Type[models.Model]) -> None:
+        """Drop the fragments of the rows of ``model`` that are written."""
+        def instance_receiver(sender, instance, **kwargs):
+            self.invalidate(sender, [instance.pk])
+
+        def bulk_write_receiver(sender, pks=None, **kwargs):
+            # Unknown pks are new rows (a bulk_create on SQLite), which have no fragments yet.
+            if pks is not None:
+                self.invalidate(sender, pks)
+
+        post_save.connect(instance_receiver, sender=model, weak=False, dispatch_uid='row_fragment_cache')
+        post_delete.connect(instance_receiver, sender=model, weak=False, dispatch_uid='row_fragment_cache')
+        bulk_write.connect(bulk_write_receiver, sender=model, weak=False, dispatch_uid='row_fragment_cache')
+
+
+row_fragment_cache = RowFragmentCache()
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Type
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404
+
+from utils.cache import response_cache
+from utils.replica import is_reading_from_replica
+from utils.signals import bulk_write
+
+
+class ObjectCache:
+    """
+    Process-local LRU of model instances keyed on ``(model label, pk)``, for
+    the detail views.
+
+    At most ``OBJECT_CACHE['MAX_ENTRIES']`` instances are kept, each for at
+    most ``OBJECT_CACHE['TTL_SECONDS']`` (forever when ``None``). Writes drop
+    the instances they touch (``post_save``, ``post_delete`` and ``bulk_write``,
+    which the favorite serializers send), once right away and again on commit.
+    Each instance also keeps the ``response_cache`` generation of its model
+    from before it was read, and is only served while that generation is
+    current, so the writes of other processes drop it too. A read that
+    started before a write is not stored, and an instance read from the
+    replica is kept no longer than the replica can lag behind and is only
+    served to requests that read from the replica too.
+    Cached instances are shared between requests and must not be modified.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (label, pk) -> (instance, expires_at, read from the replica, response cache generation)
+        self._entries = OrderedDict()
+        # Bumped by every invalidation; a load only stores its row if no write happened meanwhile.
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+            self.hits = self.misses = self.evictions = 0
+
+    def get(self, model: Type[models.Model], pk: Hashable) -> Optional[models.Model]:
+        key = (model._meta.label_lower, model._meta.pk.to_python(pk))
+        generation = response_cache.get_generation(model)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                (entry[1] is not None and entry[1] <= time.monotonic()) or entry[3] != generation
+            ):
+                del self._entries[key]
+                entry = None
+            # A client that just wrote reads from `default` (see `ReplicaMiddleware`), so it skips replica rows.
+            if entry is None or (entry[2] and not is_reading_from_replica()):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0]
+
+    def load(self, model: Type[models.Model], pk: Hashable) -> models.Model:
+        """Read the row ``pk`` and cache it; ``Http404`` when it does not exist."""
+        version, generation = self._version, response_cache.get_generation(model)
+        try:
+            instance = model.objects.get(pk=pk)
+        except model.DoesNotExist:
+            raise Http404(f"No {model._meta.object_name} matches the given query.")
+
+        ttl = settings.OBJECT_CACHE['TTL_SECONDS']
+        from_replica = is_reading_from_replica()
+        if from_replica:
+            ttl = min(ttl or settings.READ_REPLICA['REFRESH_INTERVAL'], settings.READ_REPLICA['REFRESH_INTERVAL'])
+        self._set_many([instance], ttl, version, generation, from_replica)
+        return instance
+
+    def get_or_404(self, model: Type[models.Model], pk: Hashable) -> models.Model:
+        instance = self.get(model, pk)
+        return self.load(model, pk) if instance is None else instance
+
+    def load_many(self, model: Type[models.Model], read: Callable[[], Iterable[models.Model]]) -> list:
+        """Cache and return the instances of ``model`` that ``read()`` returns."""
+        version, generation = self._version, response_cache.get_generation(model)
+        instances = list(read())
+        self._set_many(instances, settings.OBJECT_CACHE['TTL_SECONDS'], version, generation)
+        return instances
+
+    def _set_many(
+        self,
+        instances: Iterable[models.Model],
+        ttl: Optional[float],
+        version: int,
+        generation: int,
+        from_replica: bool = False,
+    ) -> None:
+        max_entries = settings.OBJECT_CACHE['MAX_ENTRIES']
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if version != self._version:
+                return
+            for instance in instances:
+                key = (instance._meta.label_lower, instance.pk)
+                self._entries.pop(key, None)
+                while self._entries and len(self._entries) >= max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                if max_entries > 0:
+                    self._entries[key] = (instance, expires_at, from_replica, generation)
+
+    def invalidate(self, model: Type[models.Model], pks: Iterable[Hashable]) -> None:
+        label, to_python = model._meta.label_lower, model._meta.pk.to_python
+        with self._lock:
+            self._version += 1
+            for pk in pks:
+                # URL captures, such as the favorite views' ids, are strings.
+                self._entries.pop((label, to_python(pk)), None)
+
+    def watch(self, model: Type[models.Model]) -> None:
+        """Drop the cached instances of the rows of ``model`` that are written."""
+        def invalidate(sender, pks):
+            self.invalidate(sender, pks)
+            transaction.on_commit(lambda: self.invalidate(sender, pks))
+
+        def instance_receiver(sender, instance, **kwargs):
+            invalidate(sender, [instance.pk])
+
+        def bulk_write_receiver(sender, pks=None, **kwargs):
+            # Unknown pks are new rows (a bulk_create on SQLite), which are not cached yet.
+            if pks is not None:
+                invalidate(sender, list(pks))
+
+        post_save.connect(instance_receiver, sender=model, weak=False, dispatch_uid='object_cache')
+        post_delete.connect(instance_receiver, sender=model, weak=False, dispatch_uid='object_cache')
+        bulk_write.connect(bulk_write_receiver, sender=model, weak=False, dispatch_uid='object_cache')
+
+
+object_cache = ObjectCache()
@@ -0,0 +1,112 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.http.request import HttpRequest
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def get_limit_query_param(request: HttpRequest, limits: Optional[dict] = None) -> int:
+    """
+    The page size of ``?limit=``, between 1 and ``limits['MAX_LIMIT']``
+    (``CURSOR_PAGINATION`` by default).
+    """
+    limits = limits or settings.CURSOR_PAGINATION
+    limit = request.GET.get('limit', limits['DEFAULT_LIMIT'])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValidationError({'limit': ['A valid integer is required.']})
+
+    if not 0 < limit <= limits['MAX_LIMIT']:
+        raise ValidationError({'limit': [f"Ensure this value is between 1 and {limits['MAX_LIMIT']}."]})
+    return limit
+
+
+class KeysetPaginator:
+    """
+    Opt-in cursor pagination ordered by ``(<ordering>, id)``.
+
+    Pagination only kicks in when the request carries ``limit`` or ``cursor``.
+    Each page seeks past the last row of the previous one instead of using an
+    OFFSET, so a deep page costs the same as the first one.
+    """
+
+    ordering_fields = ('created_at', 'name')
+    default_ordering = 'created_at'
+
+    def __init__(self, request: HttpRequest):
+        self.request = request
+        self.next_cursor = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return 'limit' in self.request.GET or 'cursor' in self.request.GET
+
+    def paginate_queryset(self, queryset: QuerySet, row_position: Optional[Callable] = None) -> list:
+        """
+        Return one page of ``queryset`` rows.
+
+        ``row_position(row, ordering)`` extracts the ``(value, id)`` key from a
+        row; by default rows are model instances.
+        """
+        ordering, position = self._get_position()
+        limit = self._get_limit()
+
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(Q(**{f'{ordering}__gt': value}) | Q(**{ordering: value, 'id__gt': pk}))
+
+        # One look-ahead row tells us whether there is a next page at all.
+        rows = list(queryset.order_by(ordering, 'id')[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            row_position = row_position or (lambda row, field: (getattr(row, field), row.id))
+            self.next_cursor = self.encode_cursor(ordering, *row_position(rows[-1], ordering))
+
+        return rows
+
+    @staticmethod
+    def encode_cursor(ordering: str, value: Any, pk: int) -> str:
+        # DjangoJSONEncoder truncates datetimes to milliseconds, which would make the seek skip rows.
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([ordering, value, pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _get_limit(self) -> int:
+        return get_limit_query_param(self.request)
+
+    def _get_position(self) -> Tuple[str, Optional[tuple]]:
+        cursor = self.request.GET.get('cursor')
+        if not cursor:
+            ordering = self.request.GET.get('ordering', self.default_ordering)
+            if ordering not in self.ordering_fields:
+                raise ValidationError({'ordering': [f"Must be one of: {', '.join(self.ordering_fields)}."]})
+            return ordering, None
+
+        try:
+            ordering, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeError, ValueError, TypeError):
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        if ordering not in self.ordering_fields or not isinstance(pk, int):
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        if not isinstance(value, str):
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        if ordering == 'created_at':
+            try:
+                value = parse_datetime(value)
+            except ValueError:
+                value = None
+            if value is None:
+                raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        return ordering, (value, pk)
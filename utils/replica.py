@@ -0,0 +1,116 @@
+import asyncio
+import sqlite3
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+
+# Alias the ORM reads from for the current request, if not `default`.
+_read_alias: ContextVar[Optional[str]] = ContextVar('read_alias', default=None)
+
+STICKY_COOKIE_NAME = 'read_your_writes'
+
+
+def get_read_alias() -> str:
+    return _read_alias.get() or 'default'
+
+
+def is_reading_from_replica() -> bool:
+    return _read_alias.get() is not None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of views that opt in with ``read_from_replica = True`` to
+    ``READ_REPLICA['ALIAS']`` (see ``ReplicaMiddleware``); everything else,
+    and every write, goes to ``default``.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints) -> str:
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        # The replica is a copy of `default`, so it is never migrated on its own.
+        return db != settings.READ_REPLICA['ALIAS']
+
+
+class ReplicaMiddleware:
+    """
+    Routes the safe requests of ``read_from_replica`` views to the replica,
+    unless the client wrote something in the last ``STICKY_SECONDS``: every
+    successful unsafe request sets a short-lived cookie that pins the client's
+    reads to ``default`` until the replica has caught up with its writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        # Under ASGI, pass as a coroutine (the way Django's `MiddlewareMixin` marks itself)
+        # so that Django does not run the rest of the chain in a thread.
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.stick_writes(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.stick_writes(request, response)
+
+    @staticmethod
+    def stick_writes(request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+        if settings.READ_REPLICA['ENABLED'] and request.method not in ('GET', 'HEAD', 'OPTIONS') \
+                and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE_NAME, '1', max_age=settings.READ_REPLICA['STICKY_SECONDS'], httponly=True, samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args, view_kwargs) -> None:
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            settings.READ_REPLICA['ENABLED']
+            and getattr(view_class, 'read_from_replica', False)
+            and request.method in ('GET', 'HEAD')
+            and STICKY_COOKIE_NAME not in request.COOKIES
+        ):
+            _read_alias.set(settings.READ_REPLICA['ALIAS'])
+
+
+def refresh_replica(source: str = 'default', replica: Optional[str] = None) -> None:
+    """
+    Copy the SQLite database of ``source`` onto the replica with the online
+    backup API, which gives the replica's readers a consistent snapshot.
+    """
+    replica = replica or settings.READ_REPLICA['ALIAS']
+    source_connection = sqlite3.connect(connections[source].settings_dict['NAME'])
+    replica_connection = sqlite3.connect(connections[replica].settings_dict['NAME'])
+    try:
+        source_connection.backup(replica_connection)
+    finally:
+        replica_connection.close()
+        source_connection.close()
@@ -0,0 +1,106 @@
+from django.db import connections
+from django.db.migrations.operations.base import Operation
+from django.db.models import QuerySet
+
+# The trigram tokenizer can only match substrings of at least this many characters.
+MIN_INDEXED_TERM_LENGTH = 3
+
+
+def get_search_index_table(db_table: str) -> str:
+    return f"{db_table}_search"
+
+
+class CreateSearchIndex(Operation):
+    """
+    Create an SQLite FTS5 trigram index over some text columns of a model.
+
+    The index is an external-content table kept in sync by triggers, so every
+    write path (``save()``, ``bulk_create()``, ``QuerySet.update()``, raw SQL)
+    updates it without any application code. Schema changes that make SQLite
+    rebuild the table drop the triggers, so such migrations need to recreate
+    the index afterwards. On other database vendors this is a no-op and
+    searches fall back to ``icontains``.
+    """
+
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name: str, fields: list):
+        self.model_name = model_name
+        self.fields = fields
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {"model_name": self.model_name, "fields": self.fields}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        table = model._meta.db_table
+        index = get_search_index_table(table)
+        pk = model._meta.pk.column
+        columns = ", ".join(model._meta.get_field(field).column for field in self.fields)
+        new_values = ", ".join(f"new.{model._meta.get_field(field).column}" for field in self.fields)
+        old_values = ", ".join(f"old.{model._meta.get_field(field).column}" for field in self.fields)
+
+        delete_old = f"INSERT INTO {index}({index}, rowid, {columns}) VALUES ('delete', old.{pk}, {old_values});"
+        insert_new = f"INSERT INTO {index}(rowid, {columns}) VALUES (new.{pk}, {new_values});"
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {index} USING fts5("
+            f"{columns}, content='{table}', content_rowid='{pk}', tokenize='trigram')"
+        )
+        schema_editor.execute(f"CREATE TRIGGER {index}_ai AFTER INSERT ON {table} BEGIN {insert_new} END")
+        schema_editor.execute(f"CREATE TRIGGER {index}_ad AFTER DELETE ON {table} BEGIN {delete_old} END")
+        # Favorite writes only touch is_favorite/updated_at and must not pay for a re-index.
+        schema_editor.execute(
+            f"CREATE TRIGGER {index}_au AFTER UPDATE OF {columns} ON {table} BEGIN {delete_old} {insert_new} END"
+        )
+        schema_editor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+
+        model = from_state.apps.get_model(app_label, self.model_name)
+        index = get_search_index_table(model._meta.db_table)
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {index}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {index}")
+
+    def describe(self):
+        return f"Create search index on {self.model_name} ({', '.join(self.fields)})"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_search_index"
+
+
+def search_queryset(queryset: QuerySet, field: str, term: str) -> QuerySet:
+    """
+    Filter ``queryset`` to rows whose ``field`` contains ``term``, best matches first.
+
+    The trigram index narrows the candidates and provides the bm25 rank; the
+    ``icontains`` filter is kept on top so the matched rows are exactly the ones
+    a plain ``icontains`` query returns.
+    """
+    queryset = queryset.filter(**{f"{field}__icontains": term})
+    if connections[queryset.db].vendor != "sqlite" or len(term) < MIN_INDEXED_TERM_LENGTH:
+        return queryset
+
+    opts = queryset.model._meta
+    table = opts.db_table
+    index = get_search_index_table(table)
+    phrase = '"{}"'.format(term.replace('"', '""'))
+
+    return queryset.extra(
+        tables=[index],
+        where=[f"{index}.rowid = {table}.{opts.pk.column}", f"{index} MATCH %s"],
+        params=[f"{opts.get_field(field).column} : {phrase}"],
+        select={"search_rank": f"{index}.rank"},
+        order_by=["search_rank", opts.pk.attname],
+    )
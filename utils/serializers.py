@@ -0,0 +1,255 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http.request import HttpRequest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from utils.fragments import row_fragment_cache
+from utils.helpers import batched, format_local_datetimes
+from utils.pagination import KeysetPaginator
+from utils.signals import bulk_write
+from utils.timing import timed
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+_encoder = DjangoJSONEncoder()
+
+# Any pk works for resolving the detail URL once; this one is unlikely to appear elsewhere in it.
+_URL_PK_PLACEHOLDER = 987654321
+
+
+def get_sparse_fields(request: HttpRequest, serializer_class, extra: Tuple[str, ...] = ()) -> Optional[Tuple[str, ...]]:
+    """
+    The ``?fields=name,url`` sparse fieldset of the request, checked against the
+    fields ``serializer_class`` renders (plus ``extra``); ``None`` when absent.
+    """
+    value = request.GET.get('fields')
+    if value is None:
+        return None
+
+    available = (*serializer_class.Meta.fields, *TIMESTAMP_FIELDS, *extra)
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    if not fields or any(name not in available for name in fields):
+        raise ValidationError({'fields': [f"Must be a comma-separated list of: {', '.join(available)}."]})
+    return fields
+
+
+class SparseFieldsetMixin:
+    """
+    ``ModelSerializer`` mixin that renders only the fields in ``context['fields']``
+    (all of them when it is absent); ``is_requested`` gates the computed ones.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested is not None:
+            for name in [name for name in self.fields if name not in requested]:
+                self.fields.pop(name)
+
+    def is_requested(self, name: str) -> bool:
+        requested = self.context.get('fields')
+        return requested is None or name in requested
+
+
+class ValuesListSerializer:
+    """
+    Read-only fast path for the list views of a ``CustomBaseModel`` serializer.
+
+    Rows are read with ``values_list()`` instead of model instances, and each
+    value goes straight to the matching DRF field's ``to_representation``. The
+    timezone and the detail URL are resolved once per request and timestamps
+    are formatted a batch at a time. The output is identical to
+    ``serializer_class(..., context={"from_list_view": True}).data``.
+
+    With a ``fields`` sparse fieldset only those keys are built, and only their
+    columns are read, plus the ones the keyset paginator may order by.
+
+    ``to_encoded_rows`` renders the same rows straight to JSON, reusing the
+    encoding of every row whose ``updated_at`` has not changed since an earlier
+    request (see ``RowFragmentCache``).
+    """
+
+    serializer_class: serializers.ModelSerializer = None
+    detail_url_name: str = None
+
+    def __init__(self, request: HttpRequest, fields: Optional[Iterable[str]] = None):
+        self.request = request
+        self.fields = (*self.serializer_class.Meta.fields, *TIMESTAMP_FIELDS, 'url') if fields is None else fields
+
+        self.field_names = [name for name in self.serializer_class.Meta.fields if name in self.fields]
+        self.timestamp_names = [name for name in TIMESTAMP_FIELDS if name in self.fields]
+        self.columns = tuple(dict.fromkeys(
+            ('id', *self.field_names, *self.timestamp_names, *KeysetPaginator.ordering_fields, 'updated_at')
+        ))
+
+        fields = self.serializer_class().fields
+        self._converters = [fields[name].to_representation for name in self.field_names]
+
+        self._url_prefix = self._url_suffix = None
+        if 'url' in self.fields:
+            url = request.build_absolute_uri(reverse(self.detail_url_name, args=(_URL_PK_PLACEHOLDER,)))
+            self._url_prefix, _, self._url_suffix = url.rpartition(str(_URL_PK_PLACEHOLDER))
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values_list(*self.columns)
+
+    def row_position(self, row: tuple, ordering: str) -> Tuple:
+        return row[self.columns.index(ordering)], row[0]
+
+    def _iter_batches(self, rows: Union[QuerySet, Iterable[tuple]]) -> Iterator[List[tuple]]:
+        if isinstance(rows, QuerySet):
+            rows = rows.iterator(chunk_size=settings.STREAMING_LIST['CHUNK_SIZE'])
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, settings.STREAMING_LIST['CHUNK_SIZE']))
+            if not batch:
+                return
+            yield batch
+
+    def to_representations(self, rows: Union[QuerySet, Iterable[tuple]]) -> Iterator[dict]:
+        for batch in self._iter_batches(rows):
+            yield from self._to_representations(batch, with_url=True)
+
+    def _to_representations(self, batch: List[tuple], with_url: bool) -> List[dict]:
+        field_specs = [
+            (name, self.columns.index(name), converter) for name, converter in zip(self.field_names, self._converters)
+        ]
+        timestamp_specs = [(offset, name, self.columns.index(name)) for offset, name in enumerate(self.timestamp_names)]
+        timestamps_per_row = len(timestamp_specs)
+        url_prefix, url_suffix = self._url_prefix, self._url_suffix
+
+        timestamps = format_local_datetimes(
+            [row[column] for row in batch for _, _, column in timestamp_specs], timezone.get_current_timezone()
+        )
+        representations = []
+        for index, row in enumerate(batch):
+            representation = {
+                name: None if row[column] is None else to_representation(row[column])
+                for name, column, to_representation in field_specs
+            }
+            for offset, name, _ in timestamp_specs:
+                representation[name] = timestamps[timestamps_per_row * index + offset]
+            if with_url and url_prefix is not None:
+                representation['url'] = f"{url_prefix}{row[0]}{url_suffix}"
+            representations.append(representation)
+        return representations
+
+    def to_encoded_rows(self, rows: Union[QuerySet, Iterable[tuple]]) -> Iterator[str]:
+        """
+        ``to_representations`` as JSON, encoding only the rows missing from
+        ``row_fragment_cache``. Building and encoding their representations are
+        timed as the ``serialize`` and ``encode`` phases of the request.
+        """
+        encode = _encoder.encode
+        label = self.serializer_class.Meta.model._meta.label_lower
+        # Fragments hold everything but the URL, which depends on the host of the request.
+        variant = (tuple(self.field_names), tuple(self.timestamp_names), timezone.get_current_timezone())
+        updated_at_column = self.columns.index('updated_at')
+
+        url_prefix = url_suffix = None
+        if self._url_prefix is not None:
+            separator = ", " if self.field_names or self.timestamp_names else ""
+            url_prefix = f"{separator}{encode('url')}: {encode(self._url_prefix)[:-1]}"
+            url_suffix = f"{encode(self._url_suffix)[1:]}}}"
+
+        for batch in self._iter_batches(rows):
+            keys = [(label, row[0], row[updated_at_column], variant) for row in batch]
+            fragments = row_fragment_cache.get_many(keys)
+            missing = [index for index, fragment in enumerate(fragments) if fragment is None]
+            if missing:
+                encoded = {}
+                with timed('serialize'):
+                    representations = self._to_representations([batch[index] for index in missing], with_url=False)
+                with timed('encode'):
+                    for index, representation in zip(missing, representations):
+                        fragments[index] = encoded[keys[index]] = encode(representation)[1:-1]
+                row_fragment_cache.set_many(encoded)
+
+            if url_prefix is None:
+                yield from (f"{{{fragment}}}" for fragment in fragments)
+            else:
+                yield from (f"{{{fragment}{url_prefix}{row[0]}{url_suffix}" for row, fragment in zip(batch, fragments))
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """
+    ``many=True`` serializer that saves all items with ``bulk_create`` in
+    ``BULK_WRITE['BATCH_SIZE']`` batches inside one transaction.
+    """
+
+    def create(self, validated_data: list) -> list:
+        model = self.child.Meta.model
+        with transaction.atomic():
+            instances = model.objects.bulk_create(
+                [model(**attrs) for attrs in validated_data],
+                batch_size=settings.BULK_WRITE['BATCH_SIZE'],
+            )
+            pks = [instance.pk for instance in instances]
+            bulk_write.send(sender=model, pks=None if None in pks else pks)
+        return instances
+
+    def get_item_errors(self) -> list:
+        """``errors`` as ``[{"index": <position>, **field_errors}]``, for the invalid items only."""
+        if not isinstance(self.errors, list):
+            return [self.errors]
+        return [{"index": index, **errors} for index, errors in enumerate(self.errors) if errors]
+
+
+class BulkFavoriteListSerializer(serializers.ListSerializer):
+    """
+    Marks many rows as favorite with set-based writes: one
+    ``UPDATE ... WHERE id IN (...)`` per batch flags every row, and the custom
+    names are then written with a single ``bulk_update``.
+    """
+
+    def create(self, validated_data: list) -> dict:
+        model = self.child.Meta.model
+        batch_size = settings.BULK_WRITE['BATCH_SIZE']
+
+        custom_names = {}
+        for item in validated_data:
+            if item.get('custom_name'):
+                custom_names[item['id']] = item['custom_name']
+            else:
+                custom_names.setdefault(item['id'], None)
+
+        with transaction.atomic():
+            found_ids = set()
+            for ids in batched(custom_names, batch_size):
+                found_ids.update(model.objects.filter(id__in=ids).values_list('id', flat=True))
+
+            now = timezone.now()
+            for ids in batched(found_ids, batch_size):
+                model.objects.filter(id__in=ids).update(is_favorite=True, updated_at=now)
+
+            # Renamed rows carry their own `updated_at`, which other processes' autocomplete indexes sync on.
+            model.objects.bulk_update(
+                [
+                    model(id=pk, custom_name=custom_name, updated_at=now)
+                    for pk, custom_name in custom_names.items() if pk in found_ids and custom_name is not None
+                ],
+                ['custom_name', 'updated_at'],
+                batch_size=batch_size,
+            )
+            bulk_write.send(sender=model, pks=sorted(found_ids))
+
+        return {
+            "favorited": sorted(found_ids),
+            "missing": [pk for pk in custom_names if pk not in found_ids],
+        }
+
+
+class FavoriteItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    custom_name = serializers.CharField(max_length=50, required=False)
+
+    class Meta:
+        list_serializer_class = BulkFavoriteListSerializer
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent with `sender=<model class>` and `pks=<iterable of primary keys>` after a write
+# that bypasses `Model.save()` (bulk_create, QuerySet.update, bulk_update), so that
+# caches and derived data can catch up the same way they do on `post_save`.
+# `pks` is None when the backend cannot tell which rows were written.
+bulk_write = Signal()
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def apply_pragmas(dbapi_connection: sqlite3.Connection, pragmas: dict) -> None:
+    for name, value in pragmas.items():
+        dbapi_connection.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_connection(sender, connection: BaseDatabaseWrapper, **kwargs) -> None:
+    """``connection_created`` receiver applying ``SQLITE_PROFILE['PRAGMAS']`` when the profile is enabled."""
+    if connection.vendor == 'sqlite' and settings.SQLITE_PROFILE['ENABLED']:
+        apply_pragmas(connection.connection, settings.SQLITE_PROFILE['PRAGMAS'])
+
+
+class WriteLock(ContextDecorator):
+    """
+    Process-wide queue for SQLite writers, used as a context manager or decorator.
+
+    SQLite allows one writer at a time, and a transaction that reads before it
+    writes cannot wait for the lock: it fails with ``database is locked`` no
+    matter the ``busy_timeout``. Holding this re-entrant lock around every write
+    makes the threads of a worker take turns instead, so ``busy_timeout`` only
+    has to cover the other processes. It does nothing unless
+    ``SQLITE_PROFILE['ENABLED']``.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._held = threading.local()
+
+    def __enter__(self):
+        self._held.stack = getattr(self._held, 'stack', [])
+        acquired = settings.SQLITE_PROFILE['ENABLED'] and self._lock.acquire()
+        self._held.stack.append(acquired)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._held.stack.pop():
+            self._lock.release()
+        return False
+
+
+write_lock = WriteLock()
@@ -0,0 +1,73 @@
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.response import HttpResponse, StreamingHttpResponse
+
+_encoder = DjangoJSONEncoder()
+
+
+def iter_json_list(
+    encoded_rows: Iterator[str], key: str, msg: str, empty_msg: str, extra: dict
+) -> Iterator[bytes]:
+    """
+    Encode ``{"msg": ..., "<key>": [...], **extra}`` from rows that are already
+    JSON encoded, ``ROWS_PER_WRITE`` rows at a time.
+
+    The bytes are identical to a ``JsonResponse`` built from the same data; the
+    first row is read before the ``msg`` goes out because the message depends on
+    whether the list is empty.
+    """
+    encode = _encoder.encode
+    first_row = next(encoded_rows, None)
+
+    yield "{{{}: {}, {}: [".format(
+        encode("msg"), encode(msg if first_row is not None else empty_msg), encode(key)
+    ).encode()
+
+    if first_row is not None:
+        buffer = [first_row]
+        for row in encoded_rows:
+            buffer.append(row)
+            if len(buffer) >= settings.STREAMING_LIST['ROWS_PER_WRITE']:
+                yield ", ".join(buffer).encode()
+                buffer = [""]
+        if buffer != [""]:
+            yield ", ".join(buffer).encode()
+
+    yield "]{}}}".format("".join(f", {encode(name)}: {encode(value)}" for name, value in extra.items())).encode()
+
+
+class JsonListResponse(HttpResponse):
+    """``JsonResponse`` of a list whose rows are already JSON encoded, see ``iter_json_list``."""
+
+    def __init__(
+        self,
+        encoded_rows: Iterable[str],
+        key: str,
+        msg: str,
+        empty_msg: str,
+        extra: Optional[dict] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(b"".join(iter_json_list(iter(encoded_rows), key, msg, empty_msg, extra or {})), **kwargs)
+
+
+class StreamingJsonListResponse(StreamingHttpResponse):
+    """
+    Stream a ``JsonListResponse`` while the rows are still being read and
+    encoded.
+    """
+
+    def __init__(
+        self,
+        encoded_rows: Iterable[str],
+        key: str,
+        msg: str,
+        empty_msg: str,
+        extra: Optional[dict] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(iter_json_list(iter(encoded_rows), key, msg, empty_msg, extra or {}), **kwargs)
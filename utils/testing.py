@@ -0,0 +1,24 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from utils.autocomplete import autocomplete_index
+from utils.cache import response_cache
+from utils.fragments import row_fragment_cache
+from utils.objects import object_cache
+
+
+@override_settings(SERVER_TIMING={'SAMPLE_RATE': 0.0})
+class CatalogAPITestCase(APITestCase):
+    """
+    ``APITestCase`` that starts every test with empty process-local caches: the
+    rows of a rolled back test never send the signals that would invalidate them.
+    Requests are never sampled for ``Server-Timing``, so responses and logs are
+    deterministic.
+    """
+
+    def setUp(self):
+        super().setUp()
+        response_cache.clear()
+        row_fragment_cache.clear()
+        autocomplete_index.clear()
+        object_cache.clear()
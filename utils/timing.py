@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from django.conf import settings
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+# Timings of the current request, or None when it is not sampled.
+_timings: ContextVar[Optional['RequestTimings']] = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase of one request, plus its query count."""
+
+    def __init__(self):
+        self.queries = 0
+        self.durations = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - started_at)
+
+    def get_header(self) -> str:
+        metrics = []
+        for phase, seconds in self.durations.items():
+            metric = f"{phase};dur={seconds * 1000:.2f}"
+            if phase == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """Counts the query towards the current request's timings, if it is sampled."""
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(sender, connection, **kwargs) -> None:
+    """
+    ``connection_created`` receiver adding ``execute_wrapper`` to every
+    connection. Connections are per thread, so wrapping them around a request
+    would miss the queries its async views run through ``sync_to_async``; the
+    context variable follows the request into those threads instead.
+    """
+    if execute_wrapper not in connection.execute_wrappers:
+        # At the bottom: `connection.execute_wrapper()` pops its own wrapper from the top when it exits,
+        # and the connection may have been opened inside one.
+        connection.execute_wrappers.insert(0, execute_wrapper)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to ``phase`` of the current request's
+    ``Server-Timing``. Costs a context variable lookup when the request is not
+    sampled. Queries run inside the block count towards both ``phase`` and ``db``.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started_at)
+
+
+class ServerTimingMiddleware:
+    """
+    Times a ``SERVER_TIMING['SAMPLE_RATE']`` share of the requests: query count
+    and SQL time on every database connection (see ``install_execute_wrapper``),
+    the ``timed()`` phases of the view and the total. Each sampled request gets a ``Server-Timing`` header and
+    a JSON log line on the ``utils.timing`` logger. Place it first in
+    ``MIDDLEWARE`` so the total covers the other middleware too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        # See `ReplicaMiddleware`: under ASGI, the chain must stay a coroutine.
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if self.is_async:
+            return self.__acall__(request)
+        if random.random() >= settings.SERVER_TIMING['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.report(request, response, timings, started_at)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if random.random() >= settings.SERVER_TIMING['SAMPLE_RATE']:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started_at = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.report(request, response, timings, started_at)
+
+    @staticmethod
+    def report(
+        request: HttpRequest, response: HttpResponseBase, timings: RequestTimings, started_at: float
+    ) -> HttpResponseBase:
+        timings.add('total', time.perf_counter() - started_at)
+
+        response.headers['Server-Timing'] = timings.get_header()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            **{f'{phase}_ms': round(seconds * 1000, 2) for phase, seconds in timings.durations.items()},
+        }
+        logger.info(json.dumps(record), extra={'server_timing': record})
+        return response